@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from langchain_neo4j import Neo4jGraph
+from neo4j import AsyncGraphDatabase
+
+load_dotenv()
+
+
+class PoolMetrics:
+    """Connection acquisition wait times recorded by the shared driver"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'acquisitions': self.acquisitions,
+                'total_wait_seconds': self.total_wait,
+                'avg_wait_seconds': self.total_wait / self.acquisitions if self.acquisitions else 0.0,
+                'max_wait_seconds': self.max_wait,
+            }
+
+
+class ConnectionRegistry:
+    """
+    Process-wide Neo4j connection
+
+    One Neo4jGraph is created per process and its driver is the single
+    connection pool every component borrows: the ingestion creators, the
+    LangChain graph wrappers, the QA chains and the vector indexes. The pool
+    is configured from the environment, and the schema is fetched at most
+    once, the first time a component asks for it.
+    """
+
+    MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))
+    ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60"))
+    MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+
+    _lock = threading.Lock()
+    _graph = None
+    _schema_loaded = False
+    _metrics = PoolMetrics()
+
+    @classmethod
+    def driver_config(cls):
+        """Pool settings passed to the neo4j driver"""
+        return {
+            'max_connection_pool_size': cls.MAX_POOL_SIZE,
+            'connection_acquisition_timeout': cls.ACQUISITION_TIMEOUT,
+            'max_connection_lifetime': cls.MAX_CONNECTION_LIFETIME,
+        }
+
+    @classmethod
+    def get_graph(cls, refresh_schema=False):
+        '''
+        The shared Neo4jGraph, created on first use.
+        Pass refresh_schema=True from components that need graph.schema,
+        e.g. GraphCypherQAChain; the schema is only fetched once per process
+        '''
+        with cls._lock:
+            if cls._graph is None:
+                cls._graph = Neo4jGraph(
+                    url=os.getenv("NEO4J_URI"),
+                    username=os.getenv("NEO4J_USERNAME"),
+                    password=os.getenv("NEO4J_PASSWORD"),
+                    refresh_schema=False,
+                    driver_config=cls.driver_config()
+                )
+                cls._instrument_pool(cls._graph._driver)
+            if refresh_schema and not cls._schema_loaded:
+                cls._graph.refresh_schema()
+                cls._schema_loaded = True
+        return cls._graph
+
+    @classmethod
+    def get_driver(cls):
+        """The shared neo4j driver (the connection pool of the shared Neo4jGraph)"""
+        return cls.get_graph()._driver
+
+    @classmethod
+    def create_async_driver(cls):
+        '''
+        A new AsyncGraphDatabase driver with the same credentials and pool settings.
+        Async drivers are bound to the event loop they run on, so they are not
+        shared; the caller closes it
+        '''
+        return AsyncGraphDatabase.driver(
+            os.getenv("NEO4J_URI"),
+            auth=(os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD")),
+            **cls.driver_config()
+        )
+
+    @classmethod
+    def _instrument_pool(cls, driver):
+        '''
+        Time every connection acquisition of the driver's pool.
+        The pool is a neo4j driver internal, so this is skipped if it is not there
+        '''
+        pool = getattr(driver, '_pool', None)
+        acquire = getattr(pool, 'acquire', None)
+        if acquire is None:
+            return
+
+        def timed_acquire(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return acquire(*args, **kwargs)
+            finally:
+                cls._metrics.record_wait(time.perf_counter() - started)
+
+        pool.acquire = timed_acquire
+
+    @classmethod
+    def pool_metrics(cls):
+        """In-use / idle connection counts and acquisition wait times of the shared pool"""
+        metrics = cls._metrics.snapshot()
+        metrics.update({'in_use': 0, 'idle': 0, 'max_pool_size': cls.MAX_POOL_SIZE})
+        if cls._graph is None:
+            return metrics
+
+        pool = getattr(cls._graph._driver, '_pool', None)
+        connections = getattr(pool, 'connections', {})
+        for address_connections in list(connections.values()):
+            for connection in list(address_connections):
+                if getattr(connection, 'in_use', False):
+                    metrics['in_use'] += 1
+                else:
+                    metrics['idle'] += 1
+        return metrics
+
+    @classmethod
+    def print_pool_metrics(cls):
+        metrics = cls.pool_metrics()
+        print(
+            f"Neo4j pool: {metrics['in_use']} in use, {metrics['idle']} idle "
+            f"(max {metrics['max_pool_size']}), {metrics['acquisitions']} acquisitions, "
+            f"avg wait {metrics['avg_wait_seconds'] * 1000:.1f}ms, "
+            f"max wait {metrics['max_wait_seconds'] * 1000:.1f}ms"
+        )
+
+    @classmethod
+    def close(cls):
+        """Close the shared pool, e.g. at process exit"""
+        with cls._lock:
+            if cls._graph is not None:
+                cls._graph.close()
+            cls._graph = None
+            cls._schema_loaded = False
@@ -1,19 +1,11 @@
-from langchain_neo4j import Neo4jGraph
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
+from src.database_configs.connection_registry import ConnectionRegistry
 
 
 class Neo4jGraphDb:
     """Neo4j Graph Database"""
 
     def __init__(self):
-        self._graph = Neo4jGraph(
-            url=os.getenv("NEO4J_URI"),
-            username=os.getenv("NEO4J_USERNAME"),
-            password=os.getenv("NEO4J_PASSWORD")
-        )
+        self._graph = ConnectionRegistry.get_graph(refresh_schema=True)
 
     @property
     def graph(self):
@@ -5,8 +5,8 @@ import os
 from langchain_openai import ChatOpenAI
 from langchain_ollama import ChatOllama
 from langchain_neo4j.chains.graph_qa.cypher import GraphCypherQAChain
-from langchain_neo4j import Neo4jGraph
 
+from src.database_configs.connection_registry import ConnectionRegistry
 from src.services.graph_builder.Graph.state import GraphState
 
 
@@ -25,11 +25,7 @@ class GraphQaChain:
                 api_key=os.environ.get("OPENAI_API_KEY"),
             )
         
-        self.graph = Neo4jGraph(
-            url=os.environ.get('NEO4J_URI'),
-            username=os.environ.get('NEO4J_USERNAME'),
-            password=os.environ.get('NEO4J_PASSWORD')
-        )
+        self.graph = ConnectionRegistry.get_graph(refresh_schema=True)
 
     def get_graph_qa_chain(self, state: GraphState):
         """Create a Neo4j Graph Cypher QA Chain"""
@@ -1,7 +1,7 @@
-import os
 from dotenv import load_dotenv
 from langchain_neo4j import Neo4jVector
 from langchain_huggingface.embeddings.huggingface import HuggingFaceEmbeddings
+from src.database_configs.connection_registry import ConnectionRegistry
 
 load_dotenv()
 
@@ -20,9 +20,7 @@ class Index:
         ''' Create vector for article title and abstract and Instantiate Neo4j vector from graph'''
         neo4j_vector_index = Neo4jVector.from_existing_graph(
             embedding=self.EMBEDDING_MODEL,
-            url=os.getenv("NEO4J_URI"),
-            username=os.getenv("NEO4J_USERNAME"),
-            password=os.getenv("NEO4J_PASSWORD"),
+            graph=ConnectionRegistry.get_graph(),
             index_name='title_abstract_vector',
             node_label='Article',
             text_node_properties=['title', 'abstract'],
@@ -36,9 +34,7 @@ class Index:
         
         neo4j_title_vector_index = Neo4jVector.from_existing_graph(
             embedding=self.EMBEDDING_MODEL,
-            url=os.getenv("NEO4J_URI"),
-            username=os.getenv("NEO4J_USERNAME"),
-            password=os.getenv("NEO4J_PASSWORD"),
+            graph=ConnectionRegistry.get_graph(),
             index_name='title_vector',
             node_label='Title',
             text_node_properties=['text'],
@@ -52,9 +48,7 @@ class Index:
 
         neo4j_abstract_vector_index = Neo4jVector.from_existing_graph(
             embedding=self.EMBEDDING_MODEL,
-            url=os.getenv("NEO4J_URI"),
-            username=os.getenv("NEO4J_USERNAME"),
-            password=os.getenv("NEO4J_PASSWORD"),
+            graph=ConnectionRegistry.get_graph(),
             index_name='abstract_vector',
             node_label='Abstract',
             text_node_properties=['text'],
@@ -68,9 +62,7 @@ class Index:
 
         neo4j_topic_vector_index = Neo4jVector.from_existing_graph(
             embedding=self.EMBEDDING_MODEL,
-            url=os.getenv("NEO4J_URI"),
-            username=os.getenv("NEO4J_USERNAME"),
-            password=os.getenv("NEO4J_PASSWORD"),
+            graph=ConnectionRegistry.get_graph(),
             index_name='topic_vector',
             node_label='Topic',
             text_node_properties=['text'],
@@ -2,11 +2,17 @@ from langchain_openai import ChatOpenAI
 from langchain_ollama import ChatOllama
 from langchain_experimental.graph_transformers import LLMGraphTransformer
 from langchain_core.documents import Document
-from pyvis.network import Network
+from langchain_text_splitters import TokenTextSplitter
+import tiktoken
 from dotenv import load_dotenv
 import os
 import asyncio
 from src.database_configs.neo4j_graph_db import Neo4jGraphDb
+from src.services.knowledge_graph_tools.entity_resolution import EntityResolver
+from src.services.knowledge_graph_tools.extraction_cache import ExtractionCache
+from src.services.knowledge_graph_tools.graph_document_writer import GraphDocumentWriter
+from src.services.knowledge_graph_tools.graph_documents import merge_graph_documents
+from src.services.knowledge_graph_tools.graph_visualizer import GraphVisualizer
 from typing import Literal
 
 load_dotenv()
@@ -16,12 +22,26 @@ class KnowledgeGraphBuilder:
     """Knowledge Graph Builder"""
 
     OLLAMA_CONNECT_URL = os.getenv("OLLAMA_CONNECT_URL")
+    CHUNK_SIZE = int(os.getenv("KG_CHUNK_SIZE", "1000"))
+    CHUNK_OVERLAP = int(os.getenv("KG_CHUNK_OVERLAP", "100"))
+    EXTRACTION_CONCURRENCY = int(os.getenv("KG_EXTRACTION_CONCURRENCY", "4"))
+    TOKEN_ENCODING = "gpt2"
+    EXTRACTION_CACHE_PATH = os.getenv("KG_EXTRACTION_CACHE")
+    EXTRACTION_CACHE_MB = int(os.getenv("KG_EXTRACTION_CACHE_MB", "512"))
 
     def __init__(
         self,
         provider: Literal['openai', 'ollama'],
         model_name: str,
+        chunk_size: int = None,
+        chunk_overlap: int = None,
+        concurrency: int = None,
+        transformer_config: dict = None,
+        cache: ExtractionCache = None,
     ):
+        self.provider = provider
+        self.model_name = model_name
+
         if provider == 'ollama':
             self._llm = ChatOllama(
                 model=model_name,
@@ -34,7 +54,26 @@ class KnowledgeGraphBuilder:
                 temperature=0
             )
 
-        self._graph_transformer = LLMGraphTransformer(llm=self.llm)
+        # Keyword arguments of LLMGraphTransformer, also part of the extraction cache key
+        self.transformer_config = transformer_config or {}
+        self._graph_transformer = LLMGraphTransformer(llm=self.llm, **self.transformer_config)
+
+        if cache is None and self.EXTRACTION_CACHE_PATH:
+            cache = ExtractionCache(
+                self.EXTRACTION_CACHE_PATH,
+                max_bytes=self.EXTRACTION_CACHE_MB * 1024 * 1024
+            )
+        self.cache = cache
+
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.chunk_overlap = self.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        self.concurrency = concurrency or self.EXTRACTION_CONCURRENCY
+        self._text_splitter = TokenTextSplitter(
+            encoding_name=self.TOKEN_ENCODING,
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap
+        )
+        self._tokenizer = tiktoken.get_encoding(self.TOKEN_ENCODING)
 
         self._neo4j_graph = Neo4jGraphDb().graph
 
@@ -54,113 +93,111 @@ class KnowledgeGraphBuilder:
         """neo4j_graph property"""
         return self._neo4j_graph
 
-    async def extract_graph_data(self, text):
+    def split_text(self, text):
+        """
+        Splits input text into overlapping, token-bounded chunks.
+
+        Args:
+            text (str): Input text to be split.
+
+        Returns:
+            list: A list of Document objects, one per chunk, with the chunk index in metadata.
+        """
+        return [
+            Document(page_content=chunk, metadata={'chunk': index})
+            for index, chunk in enumerate(self._text_splitter.split_text(text))
+        ]
+
+    def count_tokens(self, text):
+        """Number of tokens of text, counted like the chunk sizes"""
+        return len(self._tokenizer.encode(text, disallowed_special=()))
+
+    async def extract_chunks(self, documents, semaphore=None):
+        """
+        Asynchronously runs the graph transformer over chunk documents, with at
+        most `concurrency` LLM calls in flight. Chunks found in the extraction
+        cache are not sent to the LLM.
+
+        Args:
+            documents (list): Chunk Document objects.
+            semaphore (asyncio.Semaphore): Shared limit when several texts are
+                extracted at once, a new one of `concurrency` slots by default.
+
+        Returns:
+            list: One GraphDocument per chunk, in chunk order.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+
+        async def extract(document):
+            key = None
+            if self.cache is not None:
+                key = ExtractionCache.key(
+                    document.page_content, self.provider, self.model_name, self.transformer_config
+                )
+                cached = self.cache.get(key, document)
+                if cached is not None:
+                    return cached
+
+            async with semaphore:
+                graph_documents = await self._graph_transformer.aconvert_to_graph_documents([document])
+
+            if key is not None:
+                self.cache.put(key, graph_documents[0])
+            return graph_documents[0]
+
+        return await asyncio.gather(*(extract(document) for document in documents))
+
+    async def extract_graph_data(self, text, chunked=True):
         """
         Asynchronously extracts graph data from input text using a graph transformer.
 
+        With chunked=True the text is split into overlapping chunks which are
+        extracted concurrently, and the per-chunk results are merged into one
+        GraphDocument. chunked=False sends the whole text in a single call.
+
         Args:
             text (str): Input text to be processed into graph format.
+            chunked (bool): Split the text into chunks before extraction.
 
         Returns:
             list: A list of GraphDocument objects containing nodes and relationships.
         """
-        documents = [Document(page_content=text)]
-        graph_documents = await self._graph_transformer.aconvert_to_graph_documents(documents)
+        document = Document(page_content=text)
+        if not chunked:
+            return await self.extract_chunks([document])
+
+        chunks = self.split_text(text)
+        chunk_graphs = await self.extract_chunks(chunks)
+        print(f"Extracted {len(chunks)} chunks with up to {self.concurrency} concurrent LLM calls")
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(
+                f"Extraction cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} entries, {stats['bytes'] / 1024 / 1024:.1f} MiB"
+            )
 
-        return graph_documents
+        return [merge_graph_documents(chunk_graphs, source=document)]
 
-    def visualize_graph(self, graph_documents):
+    def visualize_graph(self, graph_documents, max_nodes=None, output_file=None):
         """
         Visualizes a knowledge graph using PyVis based on the extracted graph documents.
 
+        All documents are merged; only the `max_nodes` nodes of highest degree
+        and the relationships between them are rendered, and every run writes
+        its own file under data_outputs/knowledge_graphs unless `output_file`
+        is given.
+
         Args:
             graph_documents (list): A list of GraphDocument objects with nodes and relationships.
+            max_nodes (int): Rendered node cap, KG_VIS_MAX_NODES by default.
+            output_file (str): HTML file to write.
 
         Returns:
             pyvis.network.Network: The visualized network graph object.
         """
-        # Create network
-        net = Network(
-            height="1200px",
-            width="100%",
-            directed=True,
-            notebook=False,
-            bgcolor="#222222",
-            font_color="white",
-            filter_menu=True,
-            cdn_resources='remote'
-        ) 
-
-        nodes = graph_documents[0].nodes
-        relationships = graph_documents[0].relationships
-
-        # Build lookup for valid nodes
-        node_dict = {node.id: node for node in nodes}
-        
-        # Filter out invalid edges and collect valid node IDs
-        valid_edges = []
-        valid_node_ids = set()
-        for rel in relationships:
-            if rel.source.id in node_dict and rel.target.id in node_dict:
-                valid_edges.append(rel)
-                valid_node_ids.update([rel.source.id, rel.target.id])
-
-        # Track which nodes are part of any relationship
-        connected_node_ids = set()
-        for rel in relationships:
-            connected_node_ids.add(rel.source.id)
-            connected_node_ids.add(rel.target.id)
-
-        # Add valid nodes to the graph
-        for node_id in valid_node_ids:
-            node = node_dict[node_id]
-            try:
-                net.add_node(
-                    node.id,
-                    label=node.id,
-                    title=node.type,
-                    group=node.type
-                )
-            except Exception:
-                continue  # Skip node if error occurs
-
-        # Add valid edges to the graph
-        for rel in valid_edges:
-            try:
-                net.add_edge(
-                    rel.source.id,
-                    rel.target.id,
-                    label=rel.type.lower()
-                )
-            except Exception:
-                continue  # Skip edge if error occurs
-
-        # Configure graph layout and physics
-        net.set_options("""
-            {
-                "physics": {
-                    "forceAtlas2Based": {
-                        "gravitationalConstant": -100,
-                        "centralGravity": 0.01,
-                        "springLength": 200,
-                        "springConstant": 0.08
-                    },
-                    "minVelocity": 0.75,
-                    "solver": "forceAtlas2Based"
-                }
-            }
-        """)
-
-        output_file = "data_outputs/knowledge_graph.html"
-        try:
-            net.save_graph(output_file)
-            print(f"Graph saved to {os.path.abspath(output_file)}")
-            return net
-        except Exception as e:
-            print(f"Error saving graph: {e}")
-            return None
-
-    def generate_knowledge_graph(self, text):
+        return GraphVisualizer(max_nodes=max_nodes).render(graph_documents, output_file=output_file)
+
+    def generate_knowledge_graph(self, text, chunked=True):
         """
         Generates and visualizes a knowledge graph from input text.
 
@@ -169,19 +206,47 @@ class KnowledgeGraphBuilder:
 
         Args:
             text (str): Input text to convert into a knowledge graph.
+            chunked (bool): Extract the text chunk by chunk, see extract_graph_data.
 
         Returns:
             pyvis.network.Network: The visualized network graph object.
         """
-        graph_documents = asyncio.run(self.extract_graph_data(text))
+        graph_documents = asyncio.run(self.extract_graph_data(text, chunked=chunked))
         net = self.visualize_graph(graph_documents)
 
         return graph_documents, net
 
-    def store_graph_to_db(self, graph_documents):
-        """Store generated graph documents to Neo4j Graph Database"""
-        try:
-            print("Save to neo4j db")
-            self._neo4j_graph.add_graph_documents(graph_documents)
-        except Exception as e:
-            print("Failed to store generated graph on neo4f database: ", e)
+    def resolve_entities(self, graph_documents):
+        """
+        Merges near-duplicate nodes ("Albert Einstein", "Einstein", "A. Einstein")
+        across all graph documents of a batch and rewrites relationships to the
+        merged ids.
+
+        Args:
+            graph_documents (list): GraphDocument objects of one or more texts.
+
+        Returns:
+            list: The resolved GraphDocument objects.
+        """
+        resolver = EntityResolver()
+        resolved_documents, _resolved_ids = resolver.resolve(graph_documents)
+        report = resolver.report
+        print(
+            f"Entity resolution: {report['entities']} -> {report['resolved_entities']} entities "
+            f"({report['merged']} merged)"
+        )
+        return resolved_documents
+
+    def store_graph_to_db(self, graph_documents, resolve_entities=True, batch_size=None):
+        """
+        Store generated graph documents to Neo4j Graph Database in batched
+        UNWIND MERGE statements, duplicate entities merged first.
+
+        Returns:
+            dict: Nodes / edges written, their throughput and the failed batch count.
+        """
+        if resolve_entities:
+            graph_documents = self.resolve_entities(graph_documents)
+        print("Save to neo4j db")
+        writer = GraphDocumentWriter(batch_size=batch_size)
+        return writer.write(graph_documents)
@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from langchain_core.documents import Document
+from src.services.knowledge_graph_builder import KnowledgeGraphBuilder
+from src.services.knowledge_graph_tools.graph_documents import merge_graph_documents
+
+# Marks the end of the stream on a stage queue
+_DONE = object()
+
+TEXT_SUFFIXES = ('.txt', '.md')
+
+
+def iter_documents(path, text_field='text', id_field='id'):
+    '''
+    Yield (document id, text, metadata) from a directory of .txt / .md files
+    (read recursively, id = relative path) or a JSON Lines file with one
+    document per line (id = id_field, or the line number)
+    '''
+    if os.path.isdir(path):
+        for root, _dirs, files in sorted(os.walk(path)):
+            for file_name in sorted(files):
+                if not file_name.endswith(TEXT_SUFFIXES):
+                    continue
+                file_path = os.path.join(root, file_name)
+                with open(file_path, encoding='utf-8') as f:
+                    text = f.read()
+                doc_id = os.path.relpath(file_path, path)
+                yield doc_id, text, {'source': doc_id}
+        return
+
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.pop(text_field, None)
+            if not text:
+                continue
+            doc_id = str(record.get(id_field, line_number))
+            metadata = {
+                key: value for key, value in record.items()
+                if isinstance(value, (str, int, float, bool))
+            }
+            metadata['source'] = doc_id
+            yield doc_id, text, metadata
+
+
+class CorpusIngestion:
+    """
+    Text-to-graph ingestion of a document corpus, stage by stage
+
+    A reader splits documents into chunks, document_workers extract them
+    (sharing one semaphore, so at most builder.concurrency LLM calls are in
+    flight) and merge every document's chunks into one GraphDocument, and a
+    writer resolves entities and stores every write_batch documents with the
+    batched GraphDocumentWriter. The stages are connected by bounded queues:
+    a slow stage suspends the one before it, so only a queue's worth of
+    documents is held in memory however large the corpus is. A failing
+    writer cancels the other stages and its error is raised by run.
+    """
+
+    DOCUMENT_WORKERS = int(os.getenv("KG_INGEST_WORKERS", "4"))
+    QUEUE_SIZE = int(os.getenv("KG_INGEST_QUEUE_SIZE", "16"))
+    WRITE_BATCH = int(os.getenv("KG_INGEST_WRITE_BATCH", "50"))
+
+    def __init__(
+        self,
+        builder,
+        document_workers=None,
+        queue_size=None,
+        write_batch=None,
+        report_every=10.0,
+        resolve_entities=True
+    ):
+        self.builder = builder
+        self.document_workers = document_workers or self.DOCUMENT_WORKERS
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        self.write_batch = write_batch or self.WRITE_BATCH
+        self.report_every = report_every
+        self.resolve_entities = resolve_entities
+        self.stats = {
+            'documents_read': 0,
+            'documents_extracted': 0,
+            'documents_written': 0,
+            'documents_failed': 0,
+            'chunks': 0,
+            'tokens': 0,
+            'nodes': 0,
+            'edges': 0,
+        }
+        self._chunk_queue = None
+        self._write_queue = None
+        self._started = None
+
+    async def _read(self, documents):
+        for doc_id, text, metadata in documents:
+            chunks = self.builder.split_text(text)
+            for chunk in chunks:
+                chunk.metadata.update(metadata)
+            await self._chunk_queue.put((doc_id, Document(page_content=text, metadata=metadata), chunks))
+            self.stats['documents_read'] += 1
+        for _ in range(self.document_workers):
+            await self._chunk_queue.put(_DONE)
+
+    async def _extract(self, semaphore):
+        while True:
+            item = await self._chunk_queue.get()
+            if item is _DONE:
+                return
+            doc_id, document, chunks = item
+            try:
+                chunk_graphs = await self.builder.extract_chunks(chunks, semaphore=semaphore)
+            except Exception as e:
+                self.stats['documents_failed'] += 1
+                print(f"[ingest] extraction of {doc_id} failed: {e!r}")
+                continue
+            self.stats['documents_extracted'] += 1
+            self.stats['chunks'] += len(chunks)
+            self.stats['tokens'] += self.builder.count_tokens(document.page_content)
+            await self._write_queue.put(merge_graph_documents(chunk_graphs, source=document))
+
+    def _store(self, graph_documents):
+        summary = self.builder.store_graph_to_db(
+            graph_documents, resolve_entities=self.resolve_entities
+        )
+        self.stats['documents_written'] += len(graph_documents)
+        self.stats['nodes'] += summary['nodes']
+        self.stats['edges'] += summary['edges']
+
+    async def _write(self):
+        pending = []
+        while True:
+            item = await self._write_queue.get()
+            if item is not _DONE:
+                pending.append(item)
+            if pending and (item is _DONE or len(pending) >= self.write_batch):
+                # The Neo4j write is blocking, run it off the event loop so extraction goes on
+                await asyncio.to_thread(self._store, pending)
+                pending = []
+            if item is _DONE:
+                return
+
+    def print_progress(self):
+        elapsed = time.perf_counter() - self._started
+        per_minute = self.stats['documents_extracted'] / elapsed * 60 if elapsed > 0 else 0.0
+        tokens_per_second = self.stats['tokens'] / elapsed if elapsed > 0 else 0.0
+        print(
+            f"[ingest] {elapsed:.0f}s: {self.stats['documents_read']} read, "
+            f"{self.stats['documents_extracted']} extracted, {self.stats['documents_written']} written, "
+            f"{self.stats['documents_failed']} failed | {per_minute:,.1f} docs/min, "
+            f"{tokens_per_second:,.0f} tokens/s | queues: chunks "
+            f"{self._chunk_queue.qsize()}/{self.queue_size}, "
+            f"writes {self._write_queue.qsize()}/{self.queue_size}"
+        )
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_every)
+            self.print_progress()
+
+    async def run(self, documents):
+        """Ingest an iterable of (document id, text, metadata), returns the stats"""
+        self._chunk_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._write_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.builder.concurrency)
+
+        reporter = asyncio.create_task(self._report())
+        writer = asyncio.create_task(self._write())
+        tasks = [asyncio.create_task(self._read(documents))]
+        tasks += [
+            asyncio.create_task(self._extract(semaphore)) for _ in range(self.document_workers)
+        ]
+
+        async def produce():
+            await asyncio.gather(*tasks)
+            await self._write_queue.put(_DONE)
+
+        producing = asyncio.create_task(produce())
+        try:
+            # A failed writer stops draining the write queue, the extractors would wait on it forever
+            done, _pending = await asyncio.wait(
+                [producing, writer], return_when=asyncio.FIRST_EXCEPTION
+            )
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            await producing
+            await writer
+        except BaseException:
+            for task in [*tasks, producing, writer]:
+                task.cancel()
+            raise
+        finally:
+            reporter.cancel()
+
+        self.print_progress()
+        self.stats['seconds'] = time.perf_counter() - self._started
+        return self.stats
+
+
+def main(
+    input_path,
+    provider='ollama',
+    model_name='llama3.1:8b',
+    text_field='text',
+    id_field='id',
+    document_workers=None,
+    queue_size=None,
+    write_batch=None,
+    report_every=10.0,
+    resolve_entities=True
+):
+    builder = KnowledgeGraphBuilder(provider=provider, model_name=model_name)
+    ingestion = CorpusIngestion(
+        builder,
+        document_workers=document_workers,
+        queue_size=queue_size,
+        write_batch=write_batch,
+        report_every=report_every,
+        resolve_entities=resolve_entities
+    )
+    stats = asyncio.run(ingestion.run(iter_documents(input_path, text_field, id_field)))
+    print(
+        f"Ingested {stats['documents_written']} documents ({stats['chunks']} chunks, "
+        f"{stats['tokens']} tokens) into {stats['nodes']} nodes and {stats['edges']} edges "
+        f"in {stats['seconds']:.1f}s, {stats['documents_failed']} failed"
+    )
+    if builder.cache is not None:
+        print(f"Extraction cache: {builder.cache.stats()}")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract a knowledge graph from a document corpus into Neo4j")
+    parser.add_argument('input', help="directory of .txt / .md files or a JSON Lines file of documents")
+    parser.add_argument('--provider', choices=['ollama', 'openai'], default='ollama')
+    parser.add_argument('--model', default='llama3.1:8b')
+    parser.add_argument('--text-field', default='text', help="JSON Lines field holding the document text")
+    parser.add_argument('--id-field', default='id', help="JSON Lines field holding the document id")
+    parser.add_argument('--workers', type=int, help="documents extracted at the same time")
+    parser.add_argument('--queue-size', type=int, help="documents buffered between two stages")
+    parser.add_argument('--write-batch', type=int, help="documents resolved and written together")
+    parser.add_argument('--report-every', type=float, default=10.0, help="seconds between progress lines")
+    parser.add_argument(
+        '--no-entity-resolution',
+        action='store_true',
+        help="store the extracted entities without merging near-duplicates"
+    )
+    args = parser.parse_args()
+
+    main(
+        args.input,
+        provider=args.provider,
+        model_name=args.model,
+        text_field=args.text_field,
+        id_field=args.id_field,
+        document_workers=args.workers,
+        queue_size=args.queue_size,
+        write_batch=args.write_batch,
+        report_every=args.report_every,
+        resolve_entities=not args.no_entity_resolution
+    )
@@ -0,0 +1,207 @@
+import re
+import unicodedata
+from collections import defaultdict
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+from src.services.knowledge_graph_tools.graph_documents import node_key
+
+# Tokens that do not tell two entity names apart ('a' is kept, it is usually an initial)
+STOP_TOKENS = frozenset(['the', 'dr', 'mr', 'mrs', 'ms', 'prof', 'sir'])
+
+
+def normalize_tokens(name):
+    """'Dr. Albert  Einstein' -> ('albert', 'einstein'): accents folded, lowercased, punctuation dropped"""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    tokens = re.findall(r'[a-z0-9]+', text.lower())
+    kept = tuple(token for token in tokens if token not in STOP_TOKENS)
+    return kept or tuple(tokens)
+
+
+def tokens_compatible(short, full):
+    '''
+    True when every token of short matches a token of full in order, equal
+    or as an initial: ('einstein',), ('a', 'einstein') -> ('albert', 'einstein')
+    '''
+    position = 0
+    for token in short:
+        while position < len(full):
+            candidate = full[position]
+            position += 1
+            if token == candidate or (len(token) == 1 and candidate.startswith(token)):
+                break
+        else:
+            return False
+    return True
+
+
+class UnionFind:
+    """Disjoint sets with path compression and union by size"""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        self.size.setdefault(item, 1)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return first
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+        return first
+
+
+class EntityResolver:
+    """
+    Merges near-duplicate nodes of a batch of GraphDocuments
+
+    Nodes of the same type whose names normalize to the same tokens are
+    merged ("Albert Einstein", "albert einstein", "Dr. Albert Einstein").
+    For the types in name_types, shorter names are also merged into the one
+    fuller name they abbreviate ("Einstein", "A. Einstein" -> "Albert
+    Einstein"); candidates are only compared inside a block of names sharing
+    their last token, blocks above max_block_size are skipped, and a short
+    name matching several different full names is left alone.
+
+    Every step is a pass over the nodes or a bounded comparison inside a
+    block, so a batch resolves in near-linear time. The most informative name
+    of a merged set becomes its id and relationships are rewritten to it.
+    """
+
+    NAME_TYPES = ('Person',)
+    MAX_BLOCK_SIZE = 50
+
+    def __init__(self, name_types=None, max_block_size=None):
+        self.name_types = set(self.NAME_TYPES if name_types is None else name_types)
+        self.max_block_size = max_block_size or self.MAX_BLOCK_SIZE
+        self.report = {}
+
+    def _merge_abbreviations(self, sets, names):
+        """names: (tokens, key) of one type, unioned into sets when unambiguous"""
+        blocks = defaultdict(dict)
+        for tokens, key in names:
+            # One representative key per distinct token tuple, exact duplicates are already merged
+            blocks[tokens[-1]].setdefault(tokens, key)
+
+        skipped = 0
+        for block in blocks.values():
+            if len(block) < 2:
+                continue
+            if len(block) > self.max_block_size:
+                skipped += 1
+                continue
+            # Fullest names first, so a short name sees the full names already grouped
+            ordered = sorted(block.items(), key=lambda item: (-len(item[0]), -sum(map(len, item[0]))))
+            for index, (tokens, key) in enumerate(ordered):
+                roots = {
+                    sets.find(other_key)
+                    for other_tokens, other_key in ordered[:index]
+                    if other_tokens != tokens and tokens_compatible(tokens, other_tokens)
+                }
+                if len(roots) == 1:
+                    sets.union(roots.pop(), key)
+        return skipped
+
+    def resolve(self, graph_documents):
+        '''
+        Return (resolved graph documents, {(id, type): resolved id}) with
+        duplicates merged and every relationship pointing at resolved nodes
+        '''
+        nodes = {}
+        for graph_document in graph_documents:
+            for node in graph_document.nodes:
+                nodes.setdefault(node_key(node), node)
+            for relationship in graph_document.relationships:
+                nodes.setdefault(node_key(relationship.source), relationship.source)
+                nodes.setdefault(node_key(relationship.target), relationship.target)
+
+        sets = UnionFind()
+        exact = {}
+        names_by_type = defaultdict(list)
+        tokens_of = {}
+        for key in nodes:
+            node_id, node_type = key
+            tokens = tokens_of[key] = normalize_tokens(node_id)
+            sets.find(key)
+            if not tokens:
+                continue
+            bucket = (node_type, tokens)
+            if bucket in exact:
+                sets.union(exact[bucket], key)
+            else:
+                exact[bucket] = key
+                if node_type in self.name_types:
+                    names_by_type[node_type].append((tokens, key))
+
+        skipped_blocks = sum(
+            self._merge_abbreviations(sets, names) for names in names_by_type.values()
+        )
+
+        members = defaultdict(list)
+        for key in nodes:
+            members[sets.find(key)].append(key)
+
+        resolved = {}
+        canonical = {}
+        for group in members.values():
+            # Most and longest tokens, then the plainest spelling:
+            # 'Albert Einstein' over 'A. Einstein' and 'Dr. Albert Einstein'
+            group.sort(key=lambda key: (
+                -len(tokens_of[key]), -sum(map(len, tokens_of[key])), len(str(key[0])), str(key[0])
+            ))
+            node_id, node_type = group[0]
+            merged = Node(id=node_id, type=node_type, properties={})
+            for key in group:
+                for name, value in nodes[key].properties.items():
+                    merged.properties.setdefault(name, value)
+                resolved[key] = node_id
+                canonical[key] = merged
+
+        resolved_documents = []
+        for graph_document in graph_documents:
+            document_nodes = {}
+            for node in graph_document.nodes:
+                merged = canonical[node_key(node)]
+                document_nodes.setdefault(node_key(merged), merged)
+
+            relationships = {}
+            for relationship in graph_document.relationships:
+                source = canonical[node_key(relationship.source)]
+                target = canonical[node_key(relationship.target)]
+                if source is target and node_key(relationship.source) != node_key(relationship.target):
+                    # Both ends were merged into one entity ("Einstein" -ALIAS-> "Albert Einstein")
+                    continue
+                key = (node_key(source), relationship.type, node_key(target))
+                if key not in relationships:
+                    relationships[key] = Relationship(
+                        source=source,
+                        target=target,
+                        type=relationship.type,
+                        properties=dict(relationship.properties),
+                    )
+                    document_nodes.setdefault(node_key(source), source)
+                    document_nodes.setdefault(node_key(target), target)
+
+            resolved_documents.append(GraphDocument(
+                nodes=list(document_nodes.values()),
+                relationships=list(relationships.values()),
+                source=graph_document.source,
+            ))
+
+        self.report = {
+            'entities': len(nodes),
+            'resolved_entities': len(members),
+            'merged': len(nodes) - len(members),
+            'skipped_blocks': skipped_blocks,
+        }
+        return resolved_documents, resolved
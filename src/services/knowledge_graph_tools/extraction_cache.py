@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.services.knowledge_graph_tools.graph_documents import (
+    graph_document_from_dict,
+    graph_document_to_dict,
+)
+
+
+class ExtractionCache:
+    """
+    Content-addressed local SQLite cache of LLM graph extraction results
+
+    An entry is keyed by the hash of the chunk text, the provider, the model
+    and the transformer configuration, and holds the extracted nodes and
+    relationships as JSON. Re-extracting a chunk that was seen before (a
+    re-run after a crash, a re-import, boilerplate repeated across documents)
+    is a lookup instead of an LLM generation.
+
+    With max_bytes set, the least recently used entries are evicted once the
+    stored payloads grow past it.
+    """
+
+    # Part of every key, bump when the stored payload format changes
+    VERSION = 1
+
+    def __init__(self, path='data_outputs/extraction_cache.sqlite', max_bytes=None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Chunks may be extracted from several threads, one lock serializes the connection
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, "
+            "last_used REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used)"
+        )
+        self._connection.commit()
+        self._total_bytes = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM extractions"
+        ).fetchone()[0]
+
+    @classmethod
+    def key(cls, text, provider, model_name, config=None):
+        """sha256 of the chunk text and everything that changes what the LLM extracts from it"""
+        identity = json.dumps(
+            {
+                'version': cls.VERSION,
+                'provider': provider,
+                'model_name': model_name,
+                'config': config or {},
+            },
+            sort_keys=True,
+            default=str
+        )
+        digest = hashlib.sha256(identity.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key, source):
+        """Cached GraphDocument for key rebuilt on source, None on a miss"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._connection.execute(
+                "UPDATE extractions SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._connection.commit()
+        return graph_document_from_dict(json.loads(row[0]), source)
+
+    def put(self, key, graph_document):
+        payload = json.dumps(graph_document_to_dict(graph_document), default=str)
+        size = len(payload.encode('utf-8'))
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO extractions (key, payload, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time())
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the payloads fit in max_bytes"""
+        if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM extractions ORDER BY last_used"
+        ).fetchall():
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._connection.executemany("DELETE FROM extractions WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def stats(self):
+        """Hits, misses and evictions of this process, entries and bytes on disk"""
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': self._total_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM extractions")
+            self._connection.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,203 @@
+import os
+import time
+from collections import defaultdict
+from src.database_configs.connection_registry import ConnectionRegistry
+from src.services.neo4j_graph_builder.batch_utils import iter_batches, run_batch
+
+
+def clean_name(name):
+    """LLM-produced label or relationship type without backticks, '' when nothing usable is left"""
+    return str(name or '').replace('`', '').strip()
+
+
+def quote_name(name):
+    """Backtick-quote a label or relationship type for use in Cypher"""
+    cleaned = clean_name(name)
+    if not cleaned:
+        raise ValueError(f"Empty label or relationship type: {name!r}")
+    return f"`{cleaned}`"
+
+
+class GraphDocumentWriter:
+    """
+    Batched UNWIND MERGE writer for extracted GraphDocuments
+
+    Nodes are grouped by type and relationships by (source type, type,
+    target type), so every group is one parameterized statement written in
+    batches of batch_size rows, each in its own managed transaction. Nodes
+    are merged on their id like Neo4jGraph.add_graph_documents does, and are
+    written before the relationships matching them.
+
+    Every batch is a managed transaction (execute_write), which the driver
+    already retries with exponential backoff on transient errors such as
+    deadlocks and lost connections. A batch that still fails is recorded in
+    failures and the remaining batches are written, so one bad document no
+    longer loses everything else. Nodes and relationships whose type is empty
+    once sanitized cannot be written as a label and are counted as rejected.
+    """
+
+    BATCH_SIZE = int(os.getenv("KG_WRITE_BATCH_SIZE", "1000"))
+
+    def __init__(self, driver=None, batch_size=None, ensure_indexes=True):
+        self._driver = driver
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.ensure_indexes = ensure_indexes
+        self.failures = []
+        self.rejected = {'nodes': 0, 'relationships': 0}
+        self.summary = {}
+
+    @property
+    def driver(self):
+        """Neo4j driver, the process-wide pool unless one was injected"""
+        if self._driver is None:
+            self._driver = ConnectionRegistry.get_driver()
+        return self._driver
+
+    def create_node_query(self, node_type):
+        return (
+            f"UNWIND $rows AS row "
+            f"MERGE (n:{quote_name(node_type)} {{id: row.id}}) "
+            f"SET n += row.properties"
+        )
+
+    def create_relationship_query(self, source_type, relationship_type, target_type):
+        return (
+            f"UNWIND $rows AS row "
+            f"MATCH (s:{quote_name(source_type)} {{id: row.source}}) "
+            f"MATCH (t:{quote_name(target_type)} {{id: row.target}}) "
+            f"MERGE (s)-[r:{quote_name(relationship_type)}]->(t) "
+            f"SET r += row.properties"
+        )
+
+    def group_rows(self, graph_documents):
+        '''
+        Deduplicated parameter rows: {node type: rows} and
+        {(source type, type, target type): rows}. Relationship endpoints
+        missing from a document's node list are added as nodes
+        '''
+        nodes = defaultdict(dict)
+        relationships = defaultdict(dict)
+
+        def add_node(node):
+            properties = nodes[clean_name(node.type)].setdefault(node.id, {})
+            for name, value in node.properties.items():
+                properties.setdefault(name, value)
+
+        for graph_document in graph_documents:
+            for node in graph_document.nodes:
+                if not clean_name(node.type):
+                    self.rejected['nodes'] += 1
+                    continue
+                add_node(node)
+            for relationship in graph_document.relationships:
+                group = (
+                    clean_name(relationship.source.type),
+                    clean_name(relationship.type),
+                    clean_name(relationship.target.type),
+                )
+                if not all(group):
+                    self.rejected['relationships'] += 1
+                    continue
+                add_node(relationship.source)
+                add_node(relationship.target)
+                pair = (relationship.source.id, relationship.target.id)
+                properties = relationships[group].setdefault(pair, {})
+                for name, value in relationship.properties.items():
+                    properties.setdefault(name, value)
+
+        node_rows = {
+            node_type: [
+                {'id': node_id, 'properties': properties}
+                for node_id, properties in ids.items()
+            ]
+            for node_type, ids in nodes.items()
+        }
+        relationship_rows = {
+            group: [
+                {'source': source, 'target': target, 'properties': properties}
+                for (source, target), properties in pairs.items()
+            ]
+            for group, pairs in relationships.items()
+        }
+        return node_rows, relationship_rows
+
+    def _write_batch(self, name, query, rows):
+        '''
+        Write one batch in a managed transaction (retried by the driver on
+        transient errors). Returns True when it was committed
+        '''
+        try:
+            with self.driver.session() as session:
+                session.execute_write(run_batch, query, rows)
+            return True
+        except Exception as error:
+            self.failures.append({'name': name, 'rows': len(rows), 'error': repr(error)})
+            return False
+
+    def _write_group(self, name, query, rows):
+        written = 0
+        for _offset, batch in iter_batches(rows, self.batch_size):
+            if self._write_batch(name, query, batch):
+                written += len(batch)
+        return written
+
+    def _ensure_indexes(self, node_types):
+        """Range index on id per node type, so the relationship MATCHes seek instead of scan"""
+        with self.driver.session() as session:
+            for node_type in node_types:
+                session.run(
+                    f"CREATE INDEX IF NOT EXISTS FOR (n:{quote_name(node_type)}) ON (n.id)"
+                ).consume()
+
+    def write(self, graph_documents):
+        """Write the nodes, then the relationships of graph_documents; returns the summary"""
+        rejected_before = dict(self.rejected)
+        node_rows, relationship_rows = self.group_rows(graph_documents)
+        if self.ensure_indexes and node_rows:
+            self._ensure_indexes(node_rows)
+
+        failures_before = len(self.failures)
+        started = time.perf_counter()
+        nodes = sum(
+            self._write_group(node_type, self.create_node_query(node_type), rows)
+            for node_type, rows in node_rows.items()
+        )
+        node_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        edges = sum(
+            self._write_group(
+                f"{source_type}-{relationship_type}->{target_type}",
+                self.create_relationship_query(source_type, relationship_type, target_type),
+                rows
+            )
+            for (source_type, relationship_type, target_type), rows in relationship_rows.items()
+        )
+        edge_seconds = time.perf_counter() - started
+
+        self.summary = {
+            'nodes': nodes,
+            'edges': edges,
+            'node_groups': len(node_rows),
+            'edge_groups': len(relationship_rows),
+            'nodes_per_second': nodes / node_seconds if node_seconds > 0 else float('inf'),
+            'edges_per_second': edges / edge_seconds if edge_seconds > 0 else float('inf'),
+            'failed_batches': len(self.failures) - failures_before,
+            'rejected_nodes': self.rejected['nodes'] - rejected_before['nodes'],
+            'rejected_relationships': self.rejected['relationships'] - rejected_before['relationships'],
+        }
+        print(
+            f"[graph documents] {nodes} nodes in {len(node_rows)} types "
+            f"({self.summary['nodes_per_second']:,.0f} nodes/s), "
+            f"{edges} edges in {len(relationship_rows)} groups "
+            f"({self.summary['edges_per_second']:,.0f} edges/s), "
+            f"{self.summary['failed_batches']} failed batches"
+        )
+        if self.summary['rejected_nodes'] or self.summary['rejected_relationships']:
+            print(
+                f"  rejected {self.summary['rejected_nodes']} nodes and "
+                f"{self.summary['rejected_relationships']} relationships without a type"
+            )
+        for failure in self.failures[failures_before:]:
+            print(f"  failed batch [{failure['name']}] {failure['rows']} rows: {failure['error']}")
+        return self.summary
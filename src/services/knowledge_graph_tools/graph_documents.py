@@ -0,0 +1,103 @@
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+from langchain_core.documents import Document
+
+
+def node_key(node):
+    """Identity of an extracted node: the same id may name nodes of different types"""
+    return (node.id, node.type)
+
+
+def relationship_key(relationship):
+    return (
+        node_key(relationship.source),
+        relationship.type,
+        node_key(relationship.target),
+    )
+
+
+def merge_graph_documents(graph_documents, source=None):
+    """
+    Merge graph documents (e.g. the per-chunk results of one text) into one
+
+    Nodes are deduplicated by (id, type) and relationships by
+    (source, type, target); properties of duplicates are combined, the first
+    value seen wins. Relationships are re-pointed to the merged nodes, and
+    nodes only known as a relationship endpoint are added to the node list.
+    """
+    nodes = {}
+    relationships = {}
+
+    def merged_node(node):
+        key = node_key(node)
+        if key not in nodes:
+            nodes[key] = Node(id=node.id, type=node.type, properties=dict(node.properties))
+        else:
+            for name, value in node.properties.items():
+                nodes[key].properties.setdefault(name, value)
+        return nodes[key]
+
+    for graph_document in graph_documents:
+        for node in graph_document.nodes:
+            merged_node(node)
+        for relationship in graph_document.relationships:
+            key = relationship_key(relationship)
+            if key in relationships:
+                for name, value in relationship.properties.items():
+                    relationships[key].properties.setdefault(name, value)
+                continue
+            relationships[key] = Relationship(
+                source=merged_node(relationship.source),
+                target=merged_node(relationship.target),
+                type=relationship.type,
+                properties=dict(relationship.properties),
+            )
+
+    if source is None:
+        source = graph_documents[0].source if graph_documents else Document(page_content='')
+    return GraphDocument(
+        nodes=list(nodes.values()),
+        relationships=list(relationships.values()),
+        source=source,
+    )
+
+
+def graph_document_to_dict(graph_document):
+    """JSON-serializable nodes and relationships of a graph document, without its source"""
+    return {
+        'nodes': [
+            {'id': node.id, 'type': node.type, 'properties': node.properties}
+            for node in graph_document.nodes
+        ],
+        'relationships': [
+            {
+                'source': list(node_key(relationship.source)),
+                'target': list(node_key(relationship.target)),
+                'type': relationship.type,
+                'properties': relationship.properties,
+            }
+            for relationship in graph_document.relationships
+        ],
+    }
+
+
+def graph_document_from_dict(data, source):
+    """Rebuild a graph document from graph_document_to_dict output for the given source"""
+    nodes = {
+        (node['id'], node['type']): Node(id=node['id'], type=node['type'], properties=node['properties'])
+        for node in data['nodes']
+    }
+
+    def endpoint(key):
+        node_id, node_type = key
+        return nodes.get((node_id, node_type)) or Node(id=node_id, type=node_type)
+
+    relationships = [
+        Relationship(
+            source=endpoint(relationship['source']),
+            target=endpoint(relationship['target']),
+            type=relationship['type'],
+            properties=relationship['properties'],
+        )
+        for relationship in data['relationships']
+    ]
+    return GraphDocument(nodes=list(nodes.values()), relationships=relationships, source=source)
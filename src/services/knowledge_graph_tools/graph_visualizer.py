@@ -0,0 +1,198 @@
+import heapq
+import json
+import os
+import time
+from collections import Counter
+from pyvis.edge import Edge
+from pyvis.network import Network
+from pyvis.node import Node
+from src.services.knowledge_graph_tools.graph_documents import node_key, relationship_key
+
+# Injected before the template's `return network;`, freezes the layout once the bounded stabilization is done
+FREEZE_LAYOUT_SCRIPT = (
+    "network.once('stabilizationIterationsDone', function () "
+    "{ network.setOptions({physics: false}); });\n"
+)
+
+
+def collect_graph(graph_documents):
+    '''
+    Single pass over every graph document: ({node key: node},
+    {relationship key: relationship}, Counter of node key -> degree) with
+    nodes and relationships deduplicated across documents and relationship
+    endpoints missing from a node list added
+    '''
+    nodes = {}
+    relationships = {}
+    degrees = Counter()
+    for graph_document in graph_documents:
+        for node in graph_document.nodes:
+            nodes.setdefault(node_key(node), node)
+        for relationship in graph_document.relationships:
+            key = relationship_key(relationship)
+            if key in relationships:
+                continue
+            relationships[key] = relationship
+            source, target = node_key(relationship.source), node_key(relationship.target)
+            nodes.setdefault(source, relationship.source)
+            nodes.setdefault(target, relationship.target)
+            degrees[source] += 1
+            degrees[target] += 1
+    return nodes, relationships, degrees
+
+
+class GraphVisualizer:
+    """
+    PyVis export of extracted graphs that stays usable for large graphs
+
+    All documents are merged and deduplicated in one pass. Only the
+    max_nodes nodes of highest degree (isolated nodes excluded) and at most
+    max_edges of the relationships between them are rendered, strongest
+    endpoints first, so a 100k-edge graph becomes a top-N overview. Physics
+    stabilization runs for a bounded number of iterations and the layout is
+    frozen afterwards. Every run writes its own timestamped file unless an
+    output file is given.
+
+    Nodes and edges are appended to the Network directly: Network.add_node /
+    add_edge check membership in a list on every call, which is quadratic.
+    """
+
+    MAX_NODES = int(os.getenv("KG_VIS_MAX_NODES", "2000"))
+    MAX_EDGES = int(os.getenv("KG_VIS_MAX_EDGES", "5000"))
+    STABILIZATION_ITERATIONS = int(os.getenv("KG_VIS_STABILIZATION_ITERATIONS", "200"))
+
+    def __init__(
+        self,
+        max_nodes=None,
+        max_edges=None,
+        stabilization_iterations=None,
+        output_dir='data_outputs/knowledge_graphs'
+    ):
+        self.max_nodes = max_nodes or self.MAX_NODES
+        self.max_edges = max_edges or self.MAX_EDGES
+        self.stabilization_iterations = stabilization_iterations or self.STABILIZATION_ITERATIONS
+        self.output_dir = output_dir
+        self.report = {}
+
+    def sample(self, relationships, degrees):
+        """(kept node keys, kept relationships): top max_nodes by degree and the edges between them"""
+        kept = set(heapq.nlargest(self.max_nodes, degrees, key=degrees.__getitem__))
+        edges = [
+            relationship for key, relationship in relationships.items()
+            if key[0] in kept and key[2] in kept
+        ]
+        if len(edges) > self.max_edges:
+            edges = heapq.nlargest(
+                self.max_edges,
+                edges,
+                key=lambda relationship: min(
+                    degrees[node_key(relationship.source)], degrees[node_key(relationship.target)]
+                )
+            )
+        kept = {node_key(relationship.source) for relationship in edges} | {
+            node_key(relationship.target) for relationship in edges
+        }
+        return kept, edges
+
+    def options(self):
+        return {
+            "physics": {
+                "forceAtlas2Based": {
+                    "gravitationalConstant": -100,
+                    "centralGravity": 0.01,
+                    "springLength": 200,
+                    "springConstant": 0.08
+                },
+                "minVelocity": 0.75,
+                "solver": "forceAtlas2Based",
+                "stabilization": {
+                    "enabled": True,
+                    "iterations": self.stabilization_iterations,
+                    "updateInterval": 25,
+                    "fit": True
+                }
+            },
+            "edges": {"smooth": False},
+            "interaction": {"hideEdgesOnDrag": True}
+        }
+
+    def build_network(self, nodes, kept, edges, degrees):
+        net = Network(
+            height="1200px",
+            width="100%",
+            directed=True,
+            notebook=False,
+            bgcolor="#222222",
+            font_color="white",
+            filter_menu=True,
+            cdn_resources='remote'
+        )
+        for key in sorted(kept, key=lambda key: -degrees[key]):
+            node = nodes[key]
+            # Node ids are only unique per type, the vis id combines both
+            vis_id = f"{node.type}:{node.id}"
+            options = Node(
+                vis_id,
+                'dot',
+                label=node.id,
+                font_color=net.font_color,
+                title=f"{node.type}, degree {degrees[key]}",
+                group=node.type,
+                value=degrees[key]
+            ).options
+            net.nodes.append(options)
+            net.node_ids.append(vis_id)
+            net.node_map[vis_id] = options
+
+        for relationship in edges:
+            net.edges.append(Edge(
+                f"{relationship.source.type}:{relationship.source.id}",
+                f"{relationship.target.type}:{relationship.target.id}",
+                directed=True,
+                label=relationship.type.lower()
+            ).options)
+
+        net.set_options(json.dumps(self.options()))
+        return net
+
+    def render(self, graph_documents, output_file=None):
+        '''
+        Merge, sample and write graph_documents to an HTML file.
+        Returns the pyvis Network, or None when the file could not be written
+        '''
+        started = time.perf_counter()
+        nodes, relationships, degrees = collect_graph(graph_documents)
+        kept, edges = self.sample(relationships, degrees)
+        net = self.build_network(nodes, kept, edges, degrees)
+
+        if output_file is None:
+            output_file = os.path.join(
+                self.output_dir, f"knowledge_graph_{time.strftime('%Y%m%d_%H%M%S')}.html"
+            )
+        directory = os.path.dirname(output_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        try:
+            html = net.generate_html(name=output_file)
+            html = html.replace("return network;", FREEZE_LAYOUT_SCRIPT + "return network;", 1)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(html)
+        except Exception as e:
+            print(f"Error saving graph: {e}")
+            return None
+
+        self.report = {
+            'nodes': len(nodes),
+            'relationships': len(relationships),
+            'rendered_nodes': len(kept),
+            'rendered_relationships': len(edges),
+            'seconds': time.perf_counter() - started,
+            'output_file': os.path.abspath(output_file),
+        }
+        print(
+            f"Graph saved to {self.report['output_file']}: {len(kept)} of {len(nodes)} nodes and "
+            f"{len(edges)} of {len(relationships)} relationships rendered "
+            f"in {self.report['seconds']:.2f}s"
+        )
+        return net
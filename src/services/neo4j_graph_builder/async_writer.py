@@ -0,0 +1,116 @@
+import asyncio
+import os
+import time
+from src.database_configs.connection_registry import ConnectionRegistry
+from src.services.neo4j_graph_builder.batch_utils import iter_batches
+from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator
+
+# Marks the end of the batch stream for one consumer
+_DONE = object()
+
+
+async def run_batch_async(tx, query, rows):
+    """Async transaction function: run a single UNWIND statement for one batch"""
+    result = await tx.run(query, rows=rows)
+    return await result.consume()
+
+
+class AsyncGraphWriter:
+    """
+    asyncio UNWIND batch writer on AsyncGraphDatabase
+
+    A producer turns write jobs into batches and puts them on a bounded
+    queue, a fixed number of consumers take them off and write each one in
+    its own managed transaction. Building the parameters of the next batches
+    overlaps with the transactions in flight, and a full queue suspends the
+    producer until a consumer catches up, so memory stays bounded.
+
+    A job is (name, query, rows) where rows is a list of parameter rows or a
+    sequence building them per slice (columnar.FrameRows). Jobs may come from
+    a generator, so the frames of a job are only prepared when it is reached.
+    """
+
+    CONCURRENCY = int(os.getenv("NEO4J_ASYNC_WRITERS", "4"))
+    QUEUE_SIZE = int(os.getenv("NEO4J_ASYNC_QUEUE_SIZE", "8"))
+
+    def __init__(self, driver=None, concurrency=None, queue_size=None, batch_size=None):
+        self._driver = driver
+        self.concurrency = concurrency or self.CONCURRENCY
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        self.batch_size = batch_size or GraphNodeCreator.BATCH_SIZE
+        self.summary = {}
+        self.max_queue_depth = 0
+
+    @property
+    def driver(self):
+        """Async neo4j driver, created from the ConnectionRegistry settings unless one was injected"""
+        if self._driver is None:
+            self._driver = ConnectionRegistry.create_async_driver()
+        return self._driver
+
+    def _record(self, name, rows, elapsed):
+        stats = self.summary.setdefault(name, {'rows': 0, 'batches': 0, 'seconds': 0.0})
+        stats['rows'] += rows
+        stats['batches'] += 1
+        stats['seconds'] += elapsed
+
+    async def _produce(self, jobs, queue):
+        for name, query, rows in jobs:
+            for _offset, batch in iter_batches(rows, self.batch_size):
+                await queue.put((name, query, batch))
+                self.max_queue_depth = max(self.max_queue_depth, queue.qsize())
+            # Let consumers start on the batches of this job before the next one is built
+            await asyncio.sleep(0)
+        for _ in range(self.concurrency):
+            await queue.put(_DONE)
+
+    async def _consume(self, queue):
+        async with self.driver.session() as session:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return
+                name, query, batch = item
+                started = time.perf_counter()
+                await session.execute_write(run_batch_async, query, batch)
+                self._record(name, len(batch), time.perf_counter() - started)
+
+    async def write(self, jobs):
+        '''
+        Write every batch of every job and return the total number of rows.
+        The jobs of one call have no ordering between them, write the nodes
+        and the relationships needing them in separate calls
+        '''
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        consumers = [asyncio.create_task(self._consume(queue)) for _ in range(self.concurrency)]
+        producer = asyncio.create_task(self._produce(jobs, queue))
+        rows_before = sum(stats['rows'] for stats in self.summary.values())
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(producer, *consumers)
+        except BaseException:
+            for task in [producer, *consumers]:
+                task.cancel()
+            raise
+
+        elapsed = time.perf_counter() - started
+        total = sum(stats['rows'] for stats in self.summary.values()) - rows_before
+        rate = total / elapsed if elapsed > 0 else float('inf')
+        print(
+            f"[async] {total} rows in {elapsed:.2f}s with up to {self.concurrency} "
+            f"transactions in flight ({rate:,.0f} rows/s, max queue depth {self.max_queue_depth})"
+        )
+        return total
+
+    def print_summary(self):
+        """Rows, batches and transaction time per job name"""
+        print("Async write summary:")
+        for name, stats in self.summary.items():
+            print(
+                f"  {name:<40} {stats['rows']:>10} rows {stats['batches']:>6} batches "
+                f"{stats['seconds']:>8.2f}s in transactions"
+            )
+
+    async def close(self):
+        if self._driver is not None:
+            await self._driver.close()
@@ -0,0 +1,91 @@
+import time
+
+
+def iter_batches(rows, batch_size, start=0):
+    """
+    Yield (offset, slice) for consecutive slices of ``rows`` with at most
+    ``batch_size`` items, beginning at row ``start``
+
+    Only the slices are materialized, so ``rows`` may be any sequence that
+    builds its items lazily per slice, e.g. columnar.FrameRows.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    for offset in range(start, len(rows), batch_size):
+        yield offset, rows[offset:offset + batch_size]
+
+
+def run_batch(tx, query, rows):
+    """Transaction function: run a single UNWIND statement for one batch"""
+    result = tx.run(query, rows=rows)
+    return result.consume()
+
+
+def run_batch_records(tx, query, rows):
+    """Transaction function: run one batch and return the (id, element_id) it RETURNs"""
+    result = tx.run(query, rows=rows)
+    return [(record['id'], record['element_id']) for record in result]
+
+
+def run_batch_unmatched(tx, query, rows):
+    """Transaction function: run one batch and return the (start_id, end_id) rows it could not write"""
+    result = tx.run(query, rows=rows)
+    return [(record['start_id'], record['end_id']) for record in result]
+
+
+def report_batch(name, batch_number, row_count, elapsed, total_batches=None):
+    """Print the throughput of a single committed batch"""
+    rate = row_count / elapsed if elapsed > 0 else float('inf')
+    progress = f"{batch_number}/{total_batches}" if total_batches else f"{batch_number}"
+    print(
+        f"[{name}] batch {progress}: {row_count} rows "
+        f"in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+    )
+
+
+def write_batches(
+    session,
+    name,
+    query,
+    rows,
+    batch_size,
+    checkpoint=None,
+    stage='write',
+    transaction_function=run_batch,
+    on_result=None
+):
+    """
+    Write ``rows`` through ``query`` with one managed transaction per batch
+
+    With a CheckpointManifest the rows already committed for (stage, name)
+    are skipped and the offset is recorded after every committed batch.
+    on_result receives what transaction_function returned for every
+    committed batch, e.g. the element ids of run_batch_records.
+    Returns the total number of rows written.
+    """
+    start_offset = checkpoint.completed_offset(stage, name) if checkpoint else 0
+    if start_offset:
+        print(f"[{name}] resuming at row {start_offset} of {len(rows)}")
+
+    total = 0
+    total_batches = -(-(len(rows) - start_offset) // batch_size) if batch_size > 0 else None
+    started = time.perf_counter()
+    for batch_number, (offset, batch) in enumerate(
+        iter_batches(rows, batch_size, start=start_offset), start=1
+    ):
+        batch_started = time.perf_counter()
+        result = session.execute_write(transaction_function, query, batch)
+        if on_result:
+            on_result(result)
+        if checkpoint:
+            checkpoint.record(stage, name, offset + len(batch))
+        report_batch(
+            name, batch_number, len(batch), time.perf_counter() - batch_started, total_batches
+        )
+        total += len(batch)
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else float('inf')
+    print(f"[{name}] {total} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return total
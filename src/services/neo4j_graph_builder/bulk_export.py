@@ -0,0 +1,148 @@
+import csv
+import os
+import pandas as pd
+from src.services.neo4j_graph_builder.columnar import project_frame
+from src.services.neo4j_graph_builder.graph_specs import NODE_SPECS, RELATIONSHIP_SPECS
+
+
+class BulkImportExporter:
+    """
+    Write node and relationship CSV files in the `neo4j-admin database import` format
+
+    Every node label and relationship type gets a header file and a data file:
+        nodes_<Label>_header.csv, nodes_<Label>.csv[.gz]
+        rels_<TYPE>_header.csv, rels_<TYPE>.csv[.gz]
+    The id space of a label is the label itself, so relationship files refer to
+    nodes by their business id, e.g. :START_ID(Article),:END_ID(Author).
+    """
+
+    ARRAY_DELIMITER = ';'
+
+    def __init__(self, output_dir, compress=False):
+        self.output_dir = output_dir
+        self.compress = compress
+        self._node_files = {}
+        self._relationship_files = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _data_path(self, name):
+        suffix = '.csv.gz' if self.compress else '.csv'
+        return os.path.join(self.output_dir, f"{name}{suffix}")
+
+    def _header_path(self, name):
+        return os.path.join(self.output_dir, f"{name}_header.csv")
+
+    def _write_header(self, name, header):
+        path = self._header_path(name)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(header)
+        return path
+
+    def _write_data(self, name, frame):
+        path = self._data_path(name)
+        frame.to_csv(
+            path,
+            header=False,
+            index=False,
+            compression='gzip' if self.compress else None,
+            quoting=csv.QUOTE_MINIMAL
+        )
+        return path
+
+    def property_type(self, column):
+        """neo4j-admin type of a property column, inferred from its values"""
+        if pd.api.types.is_bool_dtype(column):
+            return 'boolean'
+        if pd.api.types.is_integer_dtype(column):
+            return 'long'
+        if pd.api.types.is_float_dtype(column):
+            return 'double'
+
+        values = column.dropna()
+        if values.empty:
+            return 'string'
+        sample = values.iloc[0]
+        if isinstance(sample, (list, tuple, set)):
+            return 'string[]'
+        if isinstance(sample, bool):
+            return 'boolean'
+        if isinstance(sample, int):
+            return 'long'
+        if isinstance(sample, float):
+            return 'double'
+        return 'string'
+
+    def format_column(self, column, property_type):
+        """Serialize arrays with the array delimiter, leave scalars to the csv writer"""
+        if property_type != 'string[]':
+            return column
+        return column.map(
+            lambda items: self.ARRAY_DELIMITER.join(str(item) for item in items)
+            if isinstance(items, (list, tuple, set)) else items
+        )
+
+    def export_nodes(self, label, df):
+        '''
+        Export one label from its source frame using the label's NodeSpec.
+        Duplicate ids are dropped, the first row wins
+        '''
+        spec = NODE_SPECS[label]
+        frame = project_frame(df, spec.columns)
+        frame = frame.drop_duplicates(subset=[spec.id_key])
+
+        header = []
+        for prop in frame.columns:
+            if prop == spec.id_key:
+                header.append(f"{prop}:ID({label})")
+                frame[prop] = frame[prop].astype(str)
+                continue
+            property_type = self.property_type(frame[prop])
+            frame[prop] = self.format_column(frame[prop], property_type)
+            header.append(prop if property_type == 'string' else f"{prop}:{property_type}")
+        header.append(':LABEL')
+        frame[':LABEL'] = label
+
+        name = f"nodes_{label}"
+        files = (self._write_header(name, header), self._write_data(name, frame))
+        self._node_files[label] = files
+        print(f"Exported {len(frame)} {label} nodes to {files[1]}")
+        return files
+
+    def export_relationships(self, spec, pairs):
+        '''
+        Export (start_id, end_id) pairs of one relationship spec.
+        spec is a RelationshipSpec or its key in RELATIONSHIP_SPECS
+        '''
+        if isinstance(spec, str):
+            spec = RELATIONSHIP_SPECS[spec]
+
+        frame = pd.DataFrame(pairs, columns=['start_id', 'end_id']).astype(str)
+        frame = frame.drop_duplicates()
+        frame['type'] = spec.relationship_label
+
+        header = [
+            f":START_ID({spec.start_label})",
+            f":END_ID({spec.end_label})",
+            ':TYPE'
+        ]
+        name = f"rels_{spec.relationship_label}"
+        files = (self._write_header(name, header), self._write_data(name, frame))
+        self._relationship_files[spec.relationship_label] = files
+        print(f"Exported {len(frame)} {spec.name} relationships to {files[1]}")
+        return files
+
+    def import_command(self, database='neo4j'):
+        """The neo4j-admin command that loads every exported file into a fresh database"""
+        args = ['neo4j-admin database import full']
+        for label, (header, data) in self._node_files.items():
+            args.append(f"--nodes={label}={header},{data}")
+        for relationship_label, (header, data) in self._relationship_files.items():
+            args.append(f"--relationships={relationship_label}={header},{data}")
+        args += [
+            f"--array-delimiter='{self.ARRAY_DELIMITER}'",
+            '--multiline-fields=true',
+            '--skip-duplicate-nodes=true',
+            '--skip-bad-relationships=true',
+            database
+        ]
+        return ' \\\n    '.join(args)
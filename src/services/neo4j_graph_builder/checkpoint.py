@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+import time
+
+
+class CheckpointManifest:
+    """
+    JSON manifest of committed import batches
+
+    For every (stage, label) it keeps the row offset up to which batches were
+    committed. The file is rewritten atomically after every committed batch,
+    so after a crash a resumed run skips exactly the committed rows.
+    Stages running concurrently may record into the same manifest.
+    """
+
+    def __init__(self, path='data_outputs/import_checkpoint.json', resume=False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state = {'completed': {}}
+        if resume and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._state = json.load(f)
+        elif not resume:
+            self.reset()
+
+    def _key(self, stage, label):
+        return f"{stage}/{label}"
+
+    def completed_offset(self, stage, label):
+        """Number of leading rows of (stage, label) already committed"""
+        entry = self._state['completed'].get(self._key(stage, label))
+        return entry['offset'] if entry else 0
+
+    def record(self, stage, label, offset):
+        """Record that the rows of (stage, label) up to offset are committed"""
+        with self._lock:
+            self._state['completed'][self._key(stage, label)] = {
+                'stage': stage,
+                'label': label,
+                'offset': offset,
+                'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+            self._save()
+
+    def reset(self):
+        with self._lock:
+            self._state = {'completed': {}}
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(tmp_path, self.path)
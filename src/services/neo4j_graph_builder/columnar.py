@@ -0,0 +1,137 @@
+import importlib.util
+import re
+import pandas as pd
+
+OPENALEX_PREFIX = 'https://openalex.org/'
+_OPENALEX_PREFIX_PATTERN = f"^{re.escape(OPENALEX_PREFIX)}"
+# Arrow-backed strings need pyarrow, otherwise pandas' own string dtype is used
+TEXT_DTYPE = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') else 'string'
+
+
+def strip_openalex_prefix(series):
+    """Vectorized removal of the OpenAlex URL prefix from an id column"""
+    return series.astype(str).str.replace(_OPENALEX_PREFIX_PATTERN, '', regex=True)
+
+
+def nested_field(series, *keys):
+    """
+    Vectorized lookup into a column of nested dicts/lists
+
+    e.g. nested_field(df['primary_location'], 'source', 'id')
+    """
+    for key in keys:
+        series = series.str.get(key)
+    return series
+
+
+def unique_items(series):
+    """Deduplicate the list stored in every cell of a column"""
+    return pd.Series(
+        [list(set(items)) if items is not None else [] for items in series],
+        index=series.index,
+        dtype=object
+    )
+
+
+def project_frame(df, columns):
+    """
+    Project df onto a property -> column mapping
+
+    A mapping value is either a column name or a callable taking the whole
+    frame and returning a Series, which is how nested fields are derived.
+    """
+    return pd.DataFrame(
+        {
+            prop: column(df) if callable(column) else df[column]
+            for prop, column in columns.items()
+        },
+        index=df.index
+    )
+
+
+def unique_by(df, columns, key):
+    """Rows of df whose projected key property did not occur in an earlier row, the first row wins"""
+    keys = project_frame(df, {key: columns[key]})[key]
+    duplicated = keys.duplicated()
+    return df[~duplicated.to_numpy()] if duplicated.any() else df
+
+
+def project_rows(df, columns):
+    """Project df onto a property -> column mapping and return parameter rows"""
+    frame = project_frame(df, columns)
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.api.extensions.ExtensionDtype):
+            # Nullable/categorical/Arrow columns: pd.NA is not a Cypher value
+            frame[column] = frame[column].astype(object).where(frame[column].notna(), None)
+    return frame.to_dict('records')
+
+
+class FrameRows:
+    """
+    Parameter rows of a frame, built one slice at a time
+
+    Behaves like the list returned by project_rows for len() and slicing,
+    but only the requested slice is turned into dicts. Used for edge sets
+    too large to hold as Python dicts all at once, e.g. CITES.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.df)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return project_rows(self.df.iloc[key], self.columns)
+        return project_rows(self.df.iloc[[key]], self.columns)[0]
+
+
+def pair_list(start, end):
+    """Zip two aligned columns into (start_id, end_id) tuples"""
+    return list(zip(start.tolist(), end.tolist()))
+
+
+def is_string_column(series):
+    """True when every non-null cell of the column is a str"""
+    return pd.api.types.infer_dtype(series, skipna=True) == 'string'
+
+
+def compact_frame(df, int_columns=(), float_columns=(), category_ratio=0.5):
+    '''
+    Downcast the columns of df in place and return it
+
+    - int_columns become nullable Int32, or Int64 when the values need it
+      (missing values stay missing)
+    - float_columns become float32
+    - string columns with at most category_ratio distinct values per row
+      become categoricals, the other string columns Arrow-backed strings
+    Nested columns (lists, dicts) are left as they are.
+    '''
+    for column in df.columns:
+        series = df[column]
+        if column in int_columns:
+            numbers = pd.to_numeric(series, errors='coerce')
+            for dtype in ('Int32', 'Int64'):
+                try:
+                    df[column] = numbers.astype(dtype)
+                    break
+                except (TypeError, ValueError, OverflowError):
+                    # Out of range for Int32, or non-integral values (kept as they are)
+                    continue
+        elif column in float_columns:
+            df[column] = pd.to_numeric(series, errors='coerce').astype('float32')
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        elif is_string_column(series):
+            if len(series) and series.nunique() <= category_ratio * len(series):
+                df[column] = series.astype('category')
+            else:
+                df[column] = series.astype(TEXT_DTYPE)
+    return df
+
+
+def frame_memory_mb(df):
+    """Deep memory usage of df in MiB"""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
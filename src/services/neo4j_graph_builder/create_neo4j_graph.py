@@ -1,23 +1,43 @@
 import os
+from functools import partial
+import pandas as pd
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
+from src.database_configs.connection_registry import ConnectionRegistry
+from src.services.neo4j_graph_builder.batch_utils import (
+    run_batch_records,
+    run_batch_unmatched,
+    write_batches,
+)
+from src.services.neo4j_graph_builder.graph_specs import NODE_SPECS, RELATIONSHIP_SPECS
+from src.services.neo4j_graph_builder.columnar import (
+    FrameRows,
+    nested_field,
+    pair_list,
+    project_rows,
+    strip_openalex_prefix,
+    unique_by,
+)
 
 load_dotenv()
 
 
 class GraphNodeCreator:
-    def __init__(self):
-        self.neo4j_auradb_uri = os.getenv("NEO4J_URI")
-        self.aura_username = os.getenv("NEO4J_USERNAME")
-        self.aura_password = os.getenv("NEO4J_PASSWORD")
-        self._driver = GraphDatabase.driver(
-            self.neo4j_auradb_uri,
-            auth=(self.aura_username, self.aura_password)
-        )
+    BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+    NODE_ID_KEYS = {label: spec.id_key for label, spec in NODE_SPECS.items()}
+
+    def __init__(self, driver=None):
+        self._driver = driver
+
+    @property
+    def driver(self):
+        """Neo4j driver, the process-wide pool unless one was injected"""
+        if self._driver is None:
+            self._driver = ConnectionRegistry.get_driver()
+        return self._driver
 
     def test_neo4j_connection(self, query):
         """Test neo4j connection"""
-        with self._driver.session() as session:
+        with self.driver.session() as session:
             result = session.run(query)
             return result.data()
 
@@ -30,6 +50,23 @@ class GraphNodeCreator:
 
         return query
 
+    def create_batch_node_query(self, label, merge_key=None, return_id_key=None):
+        '''
+        Create a single parameterized cypher statement that writes a whole batch of nodes.
+        With a merge_key the nodes are upserted on that property, otherwise they are created.
+        With a return_id_key every node's (id, element_id) is returned
+        '''
+        if merge_key:
+            query = (
+                f"UNWIND $rows AS row "
+                f"MERGE (n:{label} {{{merge_key}: row.{merge_key}}}) SET n = row"
+            )
+        else:
+            query = f"UNWIND $rows AS row CREATE (n:{label}) SET n = row"
+        if return_id_key:
+            query += f" RETURN n.{return_id_key} AS id, elementId(n) AS element_id"
+        return query
+
     def update_node_query(
         self,
         label,
@@ -53,7 +90,7 @@ class GraphNodeCreator:
         MATCH ()-[r]->() DELETE r;
         '''
 
-        with self._driver.session() as session:
+        with self.driver.session() as session:
             result = session.run(query)
             return result.data()
 
@@ -63,256 +100,359 @@ class GraphNodeCreator:
         '''
 
         # Run queries using the Neo4j driver
-        with self._driver.session() as session:
+        with self.driver.session() as session:
             for query, kv in zip(queries, properties):
                 session.run(query, **kv)
         return None
+
+    def create_nodes_batched(
+        self,
+        label,
+        properties,
+        batch_size=None,
+        merge=False,
+        checkpoint=None,
+        id_map=None
+    ):
+        '''
+        Submit node properties to the Neo4j db in UNWIND batches, one transaction per batch.
+        Set merge=True to MERGE on the label's id key instead of CREATE.
+        With a CheckpointManifest, batches committed by an earlier run are skipped
+        and nodes are always MERGEd: a batch committed right before a crash is
+        not recorded yet, and is written again on resume.
+        With a NodeIdMap the elementId of every written node is collected into it
+        '''
+        merge = merge or checkpoint is not None
+        merge_key = self.NODE_ID_KEYS[label] if merge else None
+        return_id_key = self.NODE_ID_KEYS[label] if id_map is not None else None
+        query = self.create_batch_node_query(label, merge_key=merge_key, return_id_key=return_id_key)
+        collect = {}
+        if id_map is not None:
+            # The label is rewritten, elementIds collected for it by an earlier load are gone
+            id_map.clear(label)
+            collect = {
+                'transaction_function': run_batch_records,
+                'on_result': partial(id_map.add, label),
+            }
+
+        with self.driver.session() as session:
+            write_batches(
+                session,
+                label,
+                query,
+                properties,
+                batch_size or self.BATCH_SIZE,
+                checkpoint=checkpoint,
+                stage='nodes',
+                **collect
+            )
+        return None
     
+    def profile_nodes_batched(self, label, properties, profiler, sample_size=100, merge=False):
+        '''
+        Diagnostics: PROFILE the batch statement of a label with a sample batch,
+        in a rolled-back transaction (see StatementProfiler). A label that
+        already holds data is profiled in its MERGE form, the CREATE would
+        fail on the uniqueness constraint of the rows loaded before
+        '''
+        name = label
+        if not merge and not profiler.explain and profiler.has_data(label):
+            merge = True
+            name = f"{label} (MERGE, label has data)"
+        merge_key = self.NODE_ID_KEYS[label] if merge else None
+        query = self.create_batch_node_query(label, merge_key=merge_key)
+        return profiler.profile(name, query, properties[:sample_size])
+
+    def create_node_rows(self, spec, df):
+        '''
+        Build the parameter rows of one label with columnar operations on df.
+        Every node of a label shares the same query text, so it is built once.
+        Rows repeating an id are dropped (the first wins), a CREATE batch would
+        otherwise break the label's uniqueness constraint
+        '''
+        properties = project_rows(unique_by(df, spec.columns, spec.id_key), spec.columns)
+        query = self.create_single_node_query(spec.label, spec.columns)
+        create_queries = [query] * len(properties)
+        return create_queries, properties
+
     def create_article_nodes(self, df):
         """ 
-        Define functions to iterate over DataFrame to create list of queries for nodes
+        Define functions to build the list of queries for nodes from the DataFrame columns
         
         Input: A dataframe containing OpenAlex Metadata
         Output: List of queries to be submitted to neo4j
         """
-        create_queries = []
-        properties = []
-        for _, row in df.iterrows():
-            label = 'Article'
-            kv = {
-                'article_id': row['id'],
-                'title': row['title'],
-                'journal_name': row['journal'],
-                'journal_id': row['journal'],
-                'publication_year': int(row['publication_year']),
-                'doi': row['landing_page_url'],
-                'is_retracted': row['is_retracted'],
-                'citation_count': row['citation_count'],
-                # 'citation_by_yr': row['citation_by_yr']
-                # 'out_citations': [item.lstrip('https://openalex.org/') for item in row['referenced_works']],
-                'in_citations': row['incoming_citations'],
-                # 'related_works' : [item.lstrip('https://openalex.org/') for item in row['related_works']],
-                'abstract': row['abstract'],
-                'topics': row['topics_name'],
-                'funders': list(set(row['funders_list'][1])),
-                'twitter': row['twitter'],
-                'reddit': row['reddit'],
-            }
-
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Article'], df)
 
     def create_title_nodes(self, df):
         """Create title nodes"""
-
-        create_queries = []
-        properties = []
-        for _, row in df.iterrows():
-            label = 'Title'
-            kv = {
-                'title_id': row['title_id'],
-                'text': row['title'],
-                'article_id': row['id']
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)            
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Title'], df)
 
     def create_abstract_nodes(self, df):
         """Abstact Node creation"""
-        create_queries = []
-        properties = []
-        for _index, row in df.iterrows():
-            label = 'Abstract'
-            kv = {
-                'abstract_id': row['abstract_id'],
-                'text': row['abstract']
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)            
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Abstract'], df)
     
     def create_topic_nodes(self, df):
         """Topic node creation"""
-        create_queries = []
-        properties = []
-        for _index, row in df.iterrows():
-            label = 'Topic'
-            kv = {
-                'topic_id': row['topic_id'],
-                'text': row['topics_name']
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Topic'], df)
 
     def create_journal_nodes(self, df):
         """Create Journal Nodes"""
-        create_queries = []
-        properties = []
-        for _index, row in df.iterrows():
-            label = 'Journal'
-            kv = {
-                'journal_id': row['journal_id'],
-                'journal_name': row['journal'],
-                'issn': row['issn'],
-                'sjr_score': row['sjr_score'],
-                'h_index': row['h_index'],
-                'sjr_best_quartile': row['sjr_best_quartile']
-
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)            
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Journal'], df)
 
     def create_date_nodes(self, df):
         """Data Node Creation"""
-        create_queries = []
-        properties = []
-        for _index, row in df.iterrows():
-            label = 'Year'
-            kv = {
-                'year_id': str(row['publication_year']),
-                'publication_year': row['publication_year']
-
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Year'], df)
 
     def create_author_nodes(self, df):
         """Author Node Creation"""
-        create_queries = []
-        properties = []
-        for _index, row in df.iterrows():
-            label = 'Author'
-            kv = {
-                'author_id': str(row['author_id']),
-                'author_names': row['author_name'],
-                'institution_id': row['institution_id'],
-                'institution_name': row['institution_name']
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Author'], df)
 
     def create_institution_nodes(self, df):
         """Institution Node Creation"""
-        create_queries = []
-        properties = []
-        for _index, row in df.iterrows():
-            label = 'Institution'
-            kv = {
-                'institution_id': str(row['institution_id']),
-                'institution_name': row['institution_name'],
-                'institution_country_code': row['institution_country_code'],
-                'country': row['country'],
-                'city': row['city'],
-                'latitude': row['latitude'],
-                'longitude': row['longitude'],
-                'institution_type': row['institution_type'],
-                'homepage_url': row['homepage_url'],
-                'works_count': row['works_count'],
-                'cited_by_count': row['cited_by_count'],
-                'associated_institution': row['associated_institution_list']
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Institution'], df)
 
     def create_funder_nodes(self, df):
-        '''Note double for loop for funder data'''
-        create_queries = []
-        properties = []
-        for _index, row in df.iterrows():
-            label = 'Funder'
-            kv = {
-                'funder_id': row['funder_id'],
-                'funder_name': row['display_name'],
-                'country_code': row['country_code'],
-                'description': row['description'],
-                'alternate_titles': row['alternate_titles'],
-                'homepage': row['homepage_url'],
-                'grants_count': row['grants_count'],
-                'h_index': row['summary_stats']['h_index'],
-                'i10_index': row['summary_stats']['i10_index'],
-                # '2yr_mean_citedness': row['summary_stats']['2yr_mean_citedness']
-                'cited_by_count': row['cited_by_count']
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)
-            properties.append(kv)
-        return create_queries, properties
+        '''Funder Node Creation, summary_stats is unpacked column-wise'''
+        return self.create_node_rows(NODE_SPECS['Funder'], df)
 
     def create_country_nodes(self, df):
         """Country Node Creation"""
-        create_queries = []
-        properties = []
-        for _index, row in df.iterrows():
-            label = 'Country'
-            kv = {
-                'country_id': row['institution_country_code'],
-                'country_name': row['country']
-            }
-            query = self.create_single_node_query(label, kv)
-            create_queries.append(query)
-            properties.append(kv)
-        return create_queries, properties
+        return self.create_node_rows(NODE_SPECS['Country'], df)
 
     def update_funder_nodes(self, df):
         '''Function to add properties to existing node'''
-        create_queries = []
-
-        # Iterate over rows in the DataFrame and generate queries
-        for _index, row in df.iterrows():
-            label = 'Funder'
-            identifier_key = 'funder_id'
-            identifier_value = row['funder_id']
-            properties = {
-                'country_code': row['country_code'],
-                'homepage': row['homepage_url'],
-                'grants_count': row['grants_count'],
-                'h_index': row['summary_stats']['h_index'],
-                'i10_index': row['summary_stats']['i10_index'],        
-            }   
-            query = self.update_node_query(
-                label,
-                identifier_key,
-                identifier_value,
-                properties
-            )
-            create_queries.append(query)
+        properties = project_rows(df, {
+            'country_code': 'country_code',
+            'homepage': 'homepage_url',
+            'grants_count': 'grants_count',
+            'h_index': lambda frame: nested_field(frame['summary_stats'], 'h_index'),
+            'i10_index': lambda frame: nested_field(frame['summary_stats'], 'i10_index'),
+        })
+        create_queries = [
+            self.update_node_query('Funder', 'funder_id', funder_id, kv)
+            for funder_id, kv in zip(df['funder_id'].tolist(), properties)
+        ]
         return create_queries
 
 
 class GraphRelationshipCreator:
     """Relationship Creator"""
 
-    def __init__(self):
-        self.neo4j_auradb_uri = os.getenv("NEO4J_URI")
-        self.aura_username = os.getenv("NEO4J_USERNAME")
-        self.aura_password = os.getenv("NEO4J_PASSWORD")
-        self._driver = GraphDatabase.driver(
-            self.neo4j_auradb_uri,
-            auth=(self.aura_username, self.aura_password)
-        )      
+    BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+    # CITES is the largest edge set by far, it is written in bigger transactions
+    CITATION_BATCH_SIZE = int(os.getenv("NEO4J_CITATION_BATCH_SIZE", "10000"))
+
+    def __init__(self, driver=None):
+        self._driver = driver
+
+    @property
+    def driver(self):
+        """Neo4j driver, the process-wide pool unless one was injected"""
+        if self._driver is None:
+            self._driver = ConnectionRegistry.get_driver()
+        return self._driver
         
     def create_relationships(self, queries):
         """Relationship creation"""
-        with self._driver.session() as session:
+        with self.driver.session() as session:
             for query in queries:
                 session.run(query)
         return None
-    
+
+    def create_batch_relationship_query(self, spec):
+        '''
+        Create a single parameterized cypher statement that merges a whole batch of
+        relationships of one spec. The statement text only depends on the spec, so
+        Neo4j plans it once and reuses the cached plan for every batch
+        '''
+        return (
+            f"UNWIND $rows AS row "
+            f"MATCH (a:{spec.start_label} {{{spec.start_key}: row.start_id}}) "
+            f"MATCH (b:{spec.end_label} {{{spec.end_key}: row.end_id}}) "
+            f"MERGE (a)-[:{spec.relationship_label}]->(b)"
+        )
+
+    def create_element_id_relationship_query(self, spec):
+        '''
+        Batch statement addressing both endpoints by elementId, planned as an
+        element id seek instead of a property lookup. The seeked node must
+        still carry the label and business id the elementId was collected
+        for: a stale id (a node deleted since, its id reused) writes nothing
+        and its row is RETURNed, to be written by property lookup instead
+        '''
+        return (
+            f"UNWIND $rows AS row "
+            f"OPTIONAL MATCH (a:{spec.start_label}) "
+            f"WHERE elementId(a) = row.start_element_id AND a.{spec.start_key} = row.start_id "
+            f"OPTIONAL MATCH (b:{spec.end_label}) "
+            f"WHERE elementId(b) = row.end_element_id AND b.{spec.end_key} = row.end_id "
+            f"FOREACH (_ IN CASE WHEN a IS NOT NULL AND b IS NOT NULL THEN [1] ELSE [] END | "
+            f"MERGE (a)-[:{spec.relationship_label}]->(b)) "
+            f"WITH row, a, b WHERE a IS NULL OR b IS NULL "
+            f"RETURN row.start_id AS start_id, row.end_id AS end_id"
+        )
+
+    def write_resolved_relationships(self, spec, edges, id_map, batch_size=None):
+        '''
+        Write an edge frame with start_id / end_id business id columns through a
+        NodeIdMap: edges whose endpoints are both in the map are written by
+        elementId, the others and those whose elementIds turn out to be stale
+        fall back to the property MATCH statement
+        '''
+        start = id_map.resolve_series(spec.start_label, edges['start_id'])
+        end = id_map.resolve_series(spec.end_label, edges['end_id'])
+        resolved = start.notna() & end.notna()
+        by_element_id = pd.DataFrame({
+            'start_element_id': start[resolved],
+            'end_element_id': end[resolved],
+            'start_id': edges.loc[resolved, 'start_id'],
+            'end_id': edges.loc[resolved, 'end_id'],
+        })
+        unmatched = []
+        batch_size = batch_size or self.BATCH_SIZE
+
+        with self.driver.session() as session:
+            if not by_element_id.empty:
+                write_batches(
+                    session,
+                    spec.name,
+                    self.create_element_id_relationship_query(spec),
+                    FrameRows(by_element_id, {column: column for column in by_element_id.columns}),
+                    batch_size,
+                    stage='relationships',
+                    transaction_function=run_batch_unmatched,
+                    on_result=unmatched.extend
+                )
+
+            by_property = pd.concat([
+                edges.loc[~resolved, ['start_id', 'end_id']],
+                pd.DataFrame(unmatched, columns=['start_id', 'end_id']),
+            ])
+            print(
+                f"[{spec.name}] {len(by_element_id) - len(unmatched)} edges by elementId, "
+                f"{len(by_property)} by property lookup ({len(unmatched)} stale elementIds)"
+            )
+            if not by_property.empty:
+                write_batches(
+                    session,
+                    f"{spec.name} (property lookup)",
+                    self.create_batch_relationship_query(spec),
+                    FrameRows(by_property, {'start_id': 'start_id', 'end_id': 'end_id'}),
+                    batch_size,
+                    stage='relationships'
+                )
+        return None
+
+    def create_relationships_batched(
+        self,
+        spec,
+        pairs,
+        batch_size=None,
+        checkpoint=None,
+        id_map=None
+    ):
+        '''
+        Submit (start_id, end_id) pairs of one relationship spec to the Neo4j db in
+        UNWIND batches, one transaction per batch.
+        spec is a RelationshipSpec or its key in RELATIONSHIP_SPECS, e.g. 'article_author'.
+        With a CheckpointManifest, batches committed by an earlier run are skipped.
+        With a NodeIdMap, endpoints are addressed by elementId where possible
+        '''
+        if isinstance(spec, str):
+            spec = RELATIONSHIP_SPECS[spec]
+        if id_map is not None:
+            if checkpoint:
+                raise ValueError("Checkpointed imports do not support elementId resolution")
+            edges = pd.DataFrame(pairs, columns=['start_id', 'end_id'])
+            return self.write_resolved_relationships(spec, edges, id_map, batch_size=batch_size)
+
+        query = self.create_batch_relationship_query(spec)
+        rows = [
+            {'start_id': start_id, 'end_id': end_id}
+            for start_id, end_id in pairs
+        ]
+
+        with self.driver.session() as session:
+            write_batches(
+                session,
+                spec.name,
+                query,
+                rows,
+                batch_size or self.BATCH_SIZE,
+                checkpoint=checkpoint,
+                stage='relationships'
+            )
+        return None
+
+    def profile_relationships_batched(self, spec, pairs, profiler, sample_size=100):
+        '''
+        Diagnostics: PROFILE the batch statement of a relationship spec with a
+        sample batch, in a rolled-back transaction (see StatementProfiler)
+        '''
+        if isinstance(spec, str):
+            spec = RELATIONSHIP_SPECS[spec]
+
+        query = self.create_batch_relationship_query(spec)
+        rows = [
+            {'start_id': start_id, 'end_id': end_id}
+            for start_id, end_id in pairs[:sample_size]
+        ]
+        return profiler.profile(spec.name, query, rows)
+
+    def create_relationships_from_frame(
+        self,
+        spec,
+        df,
+        start_column,
+        end_column,
+        batch_size=None,
+        checkpoint=None,
+        id_map=None
+    ):
+        '''
+        Like create_relationships_batched, but the rows of each batch are built
+        from the edge table df only when that batch is sent, so an edge set of
+        tens of millions of rows never exists as Python dicts all at once
+        '''
+        if isinstance(spec, str):
+            spec = RELATIONSHIP_SPECS[spec]
+        if id_map is not None:
+            if checkpoint:
+                raise ValueError("Checkpointed imports do not support elementId resolution")
+            edges = pd.DataFrame({'start_id': df[start_column], 'end_id': df[end_column]})
+            return self.write_resolved_relationships(spec, edges, id_map, batch_size=batch_size)
+
+        query = self.create_batch_relationship_query(spec)
+        rows = FrameRows(df, {'start_id': start_column, 'end_id': end_column})
+
+        with self.driver.session() as session:
+            write_batches(
+                session,
+                spec.name,
+                query,
+                rows,
+                batch_size or self.BATCH_SIZE,
+                checkpoint=checkpoint,
+                stage='relationships'
+            )
+        return None
+
+    def create_citation_relationships(self, df, batch_size=None, checkpoint=None, id_map=None):
+        '''
+        Stream the (Article)-[CITES]->(Article) edges of a citation_df
+        in CITATION_BATCH_SIZE batches
+        '''
+        return self.create_relationships_from_frame(
+            'article_article',
+            df,
+            'article_id',
+            'cited_id',
+            batch_size=batch_size or self.CITATION_BATCH_SIZE,
+            checkpoint=checkpoint,
+            id_map=id_map
+        )
+
     def create_single_relationship_query(
         self,
         start_node,
@@ -329,278 +469,167 @@ class GraphRelationshipCreator:
         MATCH (a:{start_label} {{{start_node_id}: '{start_node}'}}), (b:{end_label} {{{end_node_id}: '{end_node}'}}) MERGE (a)-[:{relationship_label}]->(b)
         """
         return query.strip()
-    
+
+    def create_relationship_queries(self, spec, pairs):
+        """Build one inlined MATCH ... MERGE statement per (start_id, end_id) pair"""
+        template = self.create_single_relationship_query(
+            '{start_node}',
+            '{end_node}',
+            spec.relationship_label,
+            start_label=spec.start_label,
+            end_label=spec.end_label,
+            start_node_id=spec.start_key,
+            end_node_id=spec.end_key
+        ).replace('{', '{{').replace('}', '}}')
+        template = template.replace('{{start_node}}', '{0}').replace('{{end_node}}', '{1}')
+
+        return [template.format(start_node, end_node) for start_node, end_node in pairs]
+
+    def create_pairs_article_year(self, df):
+        """ (article_id, year_id) pairs """
+        return pair_list(df['id'], df['publication_year'].astype(str))
+
+    def create_pairs_article_title(self, df):
+        """ (article_id, title_id) pairs """
+        return pair_list(df['id'], df['title_id'])
+
+    def create_pairs_article_abstract(self, df):
+        """ (article_id, abstract_id) pairs """
+        return pair_list(df['id'], df['abstract_id'])
+
+    def create_pairs_article_topic(self, df):
+        """ (article_id, topic_id) pairs """
+        return pair_list(df['id'], df['topic_id'])
+
+    def create_pairs_article_journal(self, df):
+        """ (article_id, journal_id) pairs """
+        return pair_list(
+            df['id'],
+            strip_openalex_prefix(nested_field(df['primary_location'], 'source', 'id'))
+        )
+
+    def create_pairs_article_author(self, df):
+        """ (article_id, author_id) pairs
+        Use article_author_df
+        """
+        return pair_list(df['article_id'], df['author_id'].astype(str))
+
+    def create_pairs_author_institution(self, df):
+        """ (author_id, institution_id) pairs
+        Use author_institution_df
+        """
+        return pair_list(df['author_id'].astype(str), df['institution_id'].astype(str))
+
+    def create_pairs_institution_country(self, df):
+        """ (institution_id, country_id) pairs
+        Use institution_df
+        """
+        return pair_list(df['institution_id'], df['institution_country_code'])
+
+    def create_pairs_article_funder(self, df_funder):
+        """ (article_id, funder_id) pairs
+        Use article_funder_df
+        """
+        return pair_list(df_funder['article_id'], df_funder['funder_id'])
+
+    def create_pairs_funder_country(self, df):
+        """ (funder_id, country_id) pairs
+        Need a funder country dataframe
+        """
+        return pair_list(df['funder_id'], df['country_id'])
+
+    def create_pairs_article_article(self, df):
+        """ (article_id, cited_id) pairs
+        Use citation_df
+        """
+        return pair_list(df['article_id'], df['cited_id'])
+
     def create_relationship_article_year(self, df):
         """ (Article)-[YEAR_PUBLISHED]-(Year) """
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = row['id']
-            end_node = str(row['publication_year'])
-            relationship_label = 'YEAR_PUBLISHED'
-            start_label = 'Article'
-            end_label = 'Year'
-    
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='article_id',
-                end_node_id='year_id')
-        
-            relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['article_year'],
+            self.create_pairs_article_year(df)
+        )
 
     def create_relationship_article_title(self, df):
         """ (Article)-[HAS_TITLE]-(Title) """
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = row['id']
-            end_node = row['title_id']
-            relationship_label = 'HAS_TITLE'
-            start_label = 'Article'
-            end_label = 'Title'
-    
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='article_id',
-                end_node_id='title_id'
-            )
-        
-            relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['article_title'],
+            self.create_pairs_article_title(df)
+        )
 
     def create_relationship_article_abstract(self, df):
         """(Article)-[HAS_ABSTRACT]-(Abstract)"""
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = row['id']
-            end_node = row['abstract_id']
-            relationship_label = 'HAS_ABSTRACT'
-            start_label = 'Article'
-            end_label = 'Abstract'
-    
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='article_id',
-                end_node_id='abstract_id'
-            )
-        
-            relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['article_abstract'],
+            self.create_pairs_article_abstract(df)
+        )
 
     def create_relationship_article_topic(self, df):
         """ (Article)-[HAS_TOPIC]-(Topic) """
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = row['id']
-            end_node = row['topic_id']
-            relationship_label = 'HAS_TOPIC'
-            start_label = 'Article'
-            end_label = 'Topic'
-    
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='article_id',
-                end_node_id='topic_id'
-            )
-        
-            relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['article_topic'],
+            self.create_pairs_article_topic(df)
+        )
     
     def create_relationship_article_journal(self, df):
         """ (Article)-[PUBLISHED_IN]-(Journal) """
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = row['id']
-            end_node = row['primary_location']['source']['id'].lstrip('https://openalex.org/')
-            relationship_label = 'PUBLISHED_IN'
-            start_label = 'Article'
-            end_label = 'Journal'
-    
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='article_id',
-                end_node_id='journal_id'
-            )
-        
-            relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['article_journal'],
+            self.create_pairs_article_journal(df)
+        )
 
     def create_relationship_article_author(self, df):
-        """ (Article)-[WRITTEN_BY]-(Author) """
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = row['id']
-            for author_info in row['author_info']:
-                end_node = author_info[0]
-                relationship_label = 'WRITTEN_BY'
-                start_label = 'Article'
-                end_label = 'Author'
-    
-                query = self.create_single_relationship_query(
-                    start_node,
-                    end_node,
-                    relationship_label,
-                    start_label=start_label,
-                    end_label=end_label,
-                    start_node_id='article_id',
-                    end_node_id='author_id'
-                )
-        
-                relationship_queries.append(query)
-
-        return relationship_queries
+        """ (Article)-[WRITTEN_BY]-(Author)
+        Use article_author_df
+        """
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['article_author'],
+            self.create_pairs_article_author(df)
+        )
 
     def create_relationship_author_institution(self, df):
         """ (Author)-[AFFILIATED_TO]-(Institution)
-        Use author_df
+        Use author_institution_df
         """
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = str(row['author_id'])
-            end_node = str(row['institution_id'])
-            relationship_label = 'AFFILIATED_TO'
-            start_label = 'Author'
-            end_label = 'Institution'
-    
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='author_id',
-                end_node_id='institution_id'
-            )
-        
-            relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['author_institution'],
+            self.create_pairs_author_institution(df)
+        )
 
     def create_relationship_institution_country(self, df):
         """ (Institution)-[IS_FROM]-(Country)
         Use institution_df
         """
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = row['institution_id']
-            end_node = row['institution_country_code']
-            relationship_label = 'IS_FROM'
-            start_label = 'Institution'
-            end_label = 'Country'
-    
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='institution_id',
-                end_node_id='country_id'
-            )
-        
-            relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['institution_country'],
+            self.create_pairs_institution_country(df)
+        )
 
     def create_relationship_article_funder(self, df_funder):
-        """ (Article)-[FUNDED_BY]-(Funder) 
-        Need a dataframe with article and funder id
+        """ (Article)-[FUNDED_BY]-(Funder)
+        Use article_funder_df
         """
-        relationship_queries = []
-        for _, row in df_funder[df_funder['funders_list_dedup_final'] != 0].iterrows(): 
-            start_node = row['id']
-            for item in list(row['funders_list_dedup_final']):
-                end_node = item[0]
-                relationship_label = 'FUNDED_BY'
-                start_label = 'Article'
-                end_label = 'Funder'
-    
-                query = self.create_single_relationship_query(
-                    start_node,
-                    end_node,
-                    relationship_label,
-                    start_label=start_label,
-                    end_label=end_label,
-                    start_node_id='article_id',
-                    end_node_id='funder_id'
-                )
-        
-                relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['article_funder'],
+            self.create_pairs_article_funder(df_funder)
+        )
 
     def create_relationship_funder_country(self, df):
         """ (Funder)-[LOCATED_IN]-(Country)
         Need a funder country dataframe
         Create this relationship directly from Neo4j Browser
         """
-        relationship_queries = []
-        for _, row in df.iterrows():
-            start_node = row['funder_id']
-            end_node = row['country_id'] 
-            relationship_label = 'LOCATED_IN'
-            start_label = 'Funder'
-            end_label = 'Country'
-            
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='funder_id',
-                end_node_id='country_id'
-            )
-
-            relationship_queries.append(query)
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['funder_country'],
+            self.create_pairs_funder_country(df)
+        )
 
     def create_relationship_article_article(self, df):
         """ (Article)-[CITES]-(Article)
-        Use df_citations
+        Use citation_df
         """
-        relationship_queries = []
-        for _, row in df[df['funders_list_dedup_final'] != 0].iterrows():
-            start_node = row['id']
-            end_node = row['referenced_works'] 
-            relationship_label = 'CITES'
-            start_label = 'Article'
-            end_label = 'Article'
-
-            query = self.create_single_relationship_query(
-                start_node,
-                end_node,
-                relationship_label,
-                start_label=start_label,
-                end_label=end_label,
-                start_node_id='article_id',
-                end_node_id='article_id'
-            )
-
-            relationship_queries.append(query)
-        
-        return relationship_queries
+        return self.create_relationship_queries(
+            RELATIONSHIP_SPECS['article_article'],
+            self.create_pairs_article_article(df)
+        )
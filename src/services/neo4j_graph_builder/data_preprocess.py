@@ -1,10 +1,50 @@
 import pandas as pd
 import uuid
+from src.services.neo4j_graph_builder.columnar import (
+    compact_frame,
+    frame_memory_mb,
+    nested_field,
+    strip_openalex_prefix,
+)
 
 
 class DataPreprocess:
-    def __init__(self):
-        pass
+    # Namespace of the stable ids derived from OpenAlex ids
+    OPENALEX_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'https://openalex.org/')
+    # Part of the frame cache key, bump whenever a create_*_df output changes
+    VERSION = 5
+    # Positions of the fields inside every author_info entry
+    AUTHOR_INFO_FIELDS = ['author_id', 'author_name', 'institution_id', 'institution_name']
+    # Metric columns stored as nullable ints / float32 in compact mode
+    INT_COLUMNS = (
+        'citation_count', 'h_index', 'publication_year', 'works_count',
+        'cited_by_count', 'grants_count', 'twitter', 'reddit'
+    )
+    FLOAT_COLUMNS = ('sjr_score', 'latitude', 'longitude')
+
+    def __init__(self, compact=False):
+        '''
+        With compact=True every frame is downcast before it is returned:
+        low-cardinality strings (journal, country code, institution type,
+        topic name, ...) become categoricals, the metrics nullable ints or
+        float32 and the remaining text Arrow-backed strings. The article frame
+        is then also built on the input frame instead of a copy of it
+        '''
+        self.compact = compact
+        self.memory_report = {}
+
+    def finalize(self, name, df):
+        """Compact df in compact mode and report the memory it saved"""
+        if not self.compact or df is None:
+            return df
+
+        before = frame_memory_mb(df)
+        compact_frame(df, int_columns=self.INT_COLUMNS, float_columns=self.FLOAT_COLUMNS)
+        after = frame_memory_mb(df)
+        self.memory_report[name] = {'before_mb': before, 'after_mb': after}
+        saved = (1 - after / before) * 100 if before else 0.0
+        print(f"[{name}] {before:,.1f} MiB -> {after:,.1f} MiB ({saved:.0f}% saved)")
+        return df
     
     def generate_unique_uuids(self, n):
         """UUID Generation"""
@@ -13,126 +53,153 @@ class DataPreprocess:
             unique_uuids.add(str(uuid.uuid4()))
         return list(unique_uuids)
 
-    def create_article_df(self, data):
+    def generate_stable_uuids(self, openalex_ids):
+        """Stable UUID per OpenAlex id, identical across runs"""
+        return [
+            str(uuid.uuid5(self.OPENALEX_NAMESPACE, str(openalex_id)))
+            for openalex_id in openalex_ids
+        ]
+
+    def create_article_df(self, data, stable_ids=False):
         '''Input article dataframe
         Any uuid creation should be performed here for consistency
-        For production, need to find better way to create unique ids for the item below
+        With stable_ids the uuids are derived from the OpenAlex id, so a reload of the
+        same article produces the same title/abstract/topic ids
         '''
-        df = data.copy()
-        
+        # In compact mode the caller's frame is extended in place
+        df = data if self.compact else data.copy()
+
         # Generate unique UUIDs
-        df['uuid'] = self.generate_unique_uuids(len(df))
+        if stable_ids:
+            df['uuid'] = self.generate_stable_uuids(df['id'])
+        else:
+            df['uuid'] = self.generate_unique_uuids(len(df))
         # Create unique id for multiple columns
         df['title_id'] = df['uuid'].apply(lambda x: str(x)+'title')
         df['abstract_id'] = df['uuid'].apply(lambda x: str(x)+'abstract')
         df['topic_id'] = df['uuid'].apply(lambda x: str(x)+'topic')
-        return df
+        return self.finalize('article', df)
     
     def create_journal_df(self, data):
         """Journal Dataframe Creation"""
         # Create journal dataframe
-        df = data.copy()
-        df['journal_id'] = df['primary_location'].apply(
-            lambda x: x['source']['id'].lstrip('https://openalex.org')
-        )
-        df_journal = df[
-            [
-                'journal_id', 'journal', 'issn',
-                'sjr_score', 'h_index', 'sjr_best_quartile'
-            ]
-        ].copy() 
+        df_journal = data[
+            ['journal', 'issn', 'sjr_score', 'h_index', 'sjr_best_quartile']
+        ].copy()
+        # Same derivation as the article-journal pairs, so node ids and relationship keys agree
+        df_journal.insert(0, 'journal_id', strip_openalex_prefix(
+            nested_field(data['primary_location'], 'source', 'id')
+        ).to_numpy())
         df_journal.drop_duplicates(subset=['journal_id'], inplace=True)
-        return df_journal
+        return self.finalize('journal', df_journal)
     
     def create_date_df(self, data):
         """Date on Dataframe"""
         df = data[['publication_year']].copy()
         df['year_id'] = df['publication_year']
         df.drop_duplicates(subset=['year_id'], inplace=True)
-        return df
+        return self.finalize('date', df)
     
+    def explode_author_info(self, data):
+        '''
+        One row per (article, author_info entry) with the entry split into
+        AUTHOR_INFO_FIELDS columns, next to the article id
+        '''
+        authors = data[['id', 'author_info']].explode('author_info').dropna(subset=['author_info'])
+        df = pd.DataFrame({'article_id': authors['id']}, index=authors.index)
+        for position, field in enumerate(self.AUTHOR_INFO_FIELDS):
+            df[field] = nested_field(authors['author_info'], position)
+        return df.reset_index(drop=True)
+
     def create_author_df(self, data):
         """Author Dataframe"""
-        df = data.copy()
-        
-        # Extract Authors info
-        authors_info = []
-        for _index, row in df.iterrows():
-            # Create unique set of authors
-            for author_info in row['author_info']:
-                authors_info.append(
-                    [
-                        author_info[0], author_info[1],
-                        author_info[2], author_info[3]
-                    ]
-                )
+        df_author = self.explode_author_info(data)[self.AUTHOR_INFO_FIELDS]
+        df_author = df_author.drop_duplicates(subset=['author_id'])
+        return self.finalize('author', df_author)
 
-        df_author = pd.DataFrame(
-            authors_info,
-            columns=[
-                'author_id', 'author_name', 'institution_id',
-                'institution_name'
-            ]
-        )
-        df_author.drop_duplicates(subset=['author_id'], inplace=True)
-        return df_author
+    def create_article_author_df(self, data):
+        """Article Author edge table: one (article_id, author_id) row per authorship"""
+        df = self.explode_author_info(data)[['article_id', 'author_id']]
+        df = df.dropna().drop_duplicates()
+        return self.finalize('article_author', df)
 
     def create_institution_df(self, data):
         """Institution Dataframe Creation"""
-        df = data.copy()
-        df['associated_institution_list'] = df['associated_institution'].apply(
+        # drop() already returns a new frame, the input is not modified
+        df = data.drop(columns=[
+            'author_name', 'oa_extract', 'associated_institution'
+        ])
+        df['associated_institution_list'] = data['associated_institution'].apply(
             lambda x: [
                 item[0] for item in x if x is not None
             ] if x is not None else []
         )
-        df = df.drop(columns=[
-            'author_name', 'oa_extract', 'associated_institution'
-        ])
         df.drop_duplicates(subset=['institution_id'], inplace=True)
-        return df
+        return self.finalize('institution', df)
     
     def create_author_institution_df(self, data):
-        """Author Instituion Dataframe"""
-        return data[['author_id', 'institution_id']]
+        """Author Instituion edge table: one (author_id, institution_id) row per affiliation"""
+        df = data[['author_id', 'institution_id']].dropna().drop_duplicates()
+        return self.finalize('author_institution', df)
     
     def create_country_df(self, data):
         """
         Country Dataframe Creation
         """
-        df = data.copy()
-        df = df[['institution_country_code', 'country']].copy()
-        df = df.drop_duplicates(subset=['country'])
+        df = data[['institution_country_code', 'country']]
         df = df[df['country'] != 'The Netherlands']
-        return df
+        # One node per country code, the code is the Country id whatever the name is spelled
+        df = df.drop_duplicates(subset=['institution_country_code']).copy()
+        return self.finalize('country', df)
 
     def create_funder_df(self, data):
         """Funder Dataframe"""
-        df = data.copy()
-        df = df.rename(columns={'index': 'funder_id'})
-        return df
+        # rename() already returns a new frame
+        df = data.rename(columns={'index': 'funder_id'})
+        return self.finalize('funder', df)
     
     def create_article_funder_df(self, data):
-        """Article Funder Dataframe"""
-        df = data[['id', 'funders_list']].copy()
-        # Create a pair of funder id and funder name
-        df['funders_list_dedup'] = df['funders_list'].apply(
-            lambda x: set(zip(x[0], x[1]))
-        )
-        # We want to omit rows with no value or zero value
-        df['funders_list_dedup_final'] = df['funders_list_dedup'].apply(
-            lambda x: len(x) if len(x) == 0 else x
-        )
-        return df
+        '''Article Funder edge table: one (article_id, funder_id, funder_name) row per funding
+        funders_list holds [funder ids, funder names] as two aligned lists
+        '''
+        df = pd.DataFrame({
+            'article_id': data['id'],
+            'funder_id': nested_field(data['funders_list'], 0),
+            'funder_name': nested_field(data['funders_list'], 1),
+        })
+        # Articles without funders explode to NaN and are dropped
+        df = df.explode(['funder_id', 'funder_name']).dropna(subset=['funder_id'])
+        df = df.drop_duplicates(subset=['article_id', 'funder_id']).reset_index(drop=True)
+        return self.finalize('article_funder', df)
 
     def create_funder_country_df(self, data):
         """Funder Country Dataframe"""
         df = data[['funder_id', 'country_code']].copy()
         df['country_id'] = df['country_code']
-        return df[['funder_id', 'country_id']]
+        return self.finalize('funder_country', df[['funder_id', 'country_id']].copy())
     
-    def create_citation_df(self, data):
-        """Citation Dataframe
-        as place holder
-        """
-        # df = data.copy()
-        return None
+    def create_citation_df(self, data, corpus_ids=None):
+        '''Citation edge table: one (article_id, cited_id) row per reference
+        referenced_works holds OpenAlex URLs, the cited id is the bare OpenAlex id.
+        With corpus_ids (a set of article ids) references to articles outside
+        the corpus are dropped, they would have no Article node to MATCH.
+        Both sides are compared without the OpenAlex prefix and a kept cited
+        id is written like the corpus id it matched, so it MATCHes the Article
+        node whether the article ids are bare ids or OpenAlex URLs
+        '''
+        df = data[['id', 'referenced_works']].explode('referenced_works')
+        df = df.dropna(subset=['referenced_works'])
+        df = pd.DataFrame({
+            'article_id': df['id'],
+            'cited_id': strip_openalex_prefix(df['referenced_works']),
+        })
+        if corpus_ids is not None:
+            corpus = pd.Series(list(corpus_ids), dtype=object).astype(str)
+            corpus_by_bare_id = pd.Series(corpus.values, index=strip_openalex_prefix(corpus).values)
+            corpus_by_bare_id = corpus_by_bare_id[~corpus_by_bare_id.index.duplicated()]
+            df['cited_id'] = df['cited_id'].map(corpus_by_bare_id)
+            df = df.dropna(subset=['cited_id'])
+        # Self references and repeated references add no edge
+        df = df[df['article_id'] != df['cited_id']]
+        df = df.drop_duplicates().reset_index(drop=True)
+        return self.finalize('citation', df)
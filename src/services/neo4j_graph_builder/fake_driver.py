@@ -0,0 +1,134 @@
+import re
+import threading
+from neo4j.exceptions import IncompleteCommit, ServiceUnavailable
+
+
+class FakeResult:
+    """Stand-in for neo4j.Result"""
+
+    def __init__(self, records=None):
+        self._records = records or []
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def data(self):
+        return self._records
+
+    def consume(self):
+        return None
+
+
+class FakeTransaction:
+    """Stand-in for neo4j.ManagedTransaction / neo4j.Transaction that records statements"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def run(self, query, parameters=None, **kwargs):
+        return self._driver.record(query, dict(parameters or {}, **kwargs))
+
+    def commit(self):
+        return None
+
+    def rollback(self):
+        return None
+
+
+class FakeSession:
+    """Stand-in for neo4j.Session"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        return None
+
+    def run(self, query, parameters=None, **kwargs):
+        return self._driver.record(query, dict(parameters or {}, **kwargs))
+
+    def execute_write(self, transaction_function, *args, **kwargs):
+        self._driver.begin_write()
+        result = transaction_function(FakeTransaction(self._driver), *args, **kwargs)
+        self._driver.end_write()
+        return result
+
+    execute_read = execute_write
+
+    def begin_transaction(self, **kwargs):
+        return FakeTransaction(self._driver)
+
+
+class FakeDriver:
+    """
+    In-process stand-in for the Neo4j driver
+
+    Records every statement with its parameter row count instead of sending
+    it anywhere. With fail_at_batch=n the n-th write transaction (1-based)
+    raises ServiceUnavailable, which simulates a network blip mid-import.
+    With fail_after_batch=n the n-th write transaction runs and is recorded,
+    then raises IncompleteCommit: the batch committed but the client never
+    learned it.
+    Node batches RETURNing elementIds get a fake elementId per row.
+    """
+
+    def __init__(self, fail_at_batch=None, fail_after_batch=None):
+        self.fail_at_batch = fail_at_batch
+        self.fail_after_batch = fail_after_batch
+        self.statements = []
+        self.write_transactions = 0
+        self.nodes_returned = 0
+        self._lock = threading.Lock()
+
+    def session(self, **kwargs):
+        return FakeSession(self)
+
+    def begin_write(self):
+        with self._lock:
+            self.write_transactions += 1
+            if self.write_transactions == self.fail_at_batch:
+                raise ServiceUnavailable(
+                    f"Simulated failure at write transaction {self.fail_at_batch}"
+                )
+
+    def end_write(self):
+        if self.write_transactions == self.fail_after_batch:
+            raise IncompleteCommit(
+                f"Simulated lost commit confirmation of write transaction {self.fail_after_batch}"
+            )
+
+    def record(self, query, parameters):
+        with self._lock:
+            self.statements.append((query, len(parameters.get('rows', [])) or 1))
+        returned_key = re.search(r"RETURN n\.(\w+) AS id, elementId\(n\) AS element_id", query)
+        if returned_key:
+            with self._lock:
+                first = self.nodes_returned
+                self.nodes_returned += len(parameters['rows'])
+            return FakeResult([
+                {'id': row[returned_key.group(1)], 'element_id': f"4:fake:{first + offset}"}
+                for offset, row in enumerate(parameters['rows'])
+            ])
+        if query.startswith('SHOW INDEXES'):
+            # Every schema object asked for is reported ONLINE
+            return FakeResult([
+                {'name': name, 'state': 'ONLINE', 'populationPercent': 100.0}
+                for name in parameters.get('names', [])
+            ])
+        return FakeResult()
+
+    def rows_written(self, query_prefix=''):
+        """Total parameter rows of the recorded statements starting with query_prefix"""
+        return sum(rows for query, rows in self.statements if query.startswith(query_prefix))
+
+    def verify_connectivity(self):
+        return None
+
+    def close(self):
+        return None
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import sqlite3
+import pandas as pd
+
+
+class FingerprintStore:
+    """
+    Local SQLite store of one content hash per imported article
+
+    A refresh only writes articles whose hash is missing (new) or different
+    (changed) from the stored one. Hashes are committed after the article's
+    batch was written, so a failed run does not mark unwritten rows as done.
+    """
+
+    # sqlite limits the number of bound parameters per statement
+    LOOKUP_BATCH = 900
+
+    def __init__(self, path='data_outputs/fingerprints.sqlite'):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "article_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+            "updated_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        self._connection.commit()
+
+    def fingerprint(self, df, columns=None):
+        """sha1 of the canonical JSON of every row, as a Series aligned with df"""
+        frame = df[columns] if columns else df
+        return pd.Series(
+            [
+                hashlib.sha1(
+                    json.dumps(record, sort_keys=True, default=str).encode('utf-8')
+                ).hexdigest()
+                for record in frame.to_dict('records')
+            ],
+            index=df.index
+        )
+
+    def lookup(self, article_ids):
+        """Stored fingerprints of the given ids"""
+        article_ids = list(article_ids)
+        stored = {}
+        for offset in range(0, len(article_ids), self.LOOKUP_BATCH):
+            batch = article_ids[offset:offset + self.LOOKUP_BATCH]
+            placeholders = ', '.join('?' * len(batch))
+            rows = self._connection.execute(
+                f"SELECT article_id, fingerprint FROM fingerprints WHERE article_id IN ({placeholders})",
+                batch
+            )
+            stored.update(rows)
+        return stored
+
+    def diff(self, df, id_column='id', columns=None):
+        '''
+        Split df into new and changed rows, unchanged rows are dropped.
+        Returns (new_df, changed_df, fingerprints of both)
+        '''
+        fingerprints = self.fingerprint(df, columns)
+        ids = df[id_column].astype(str)
+        stored = ids.map(self.lookup(ids.tolist()))
+
+        is_new = stored.isna()
+        is_changed = ~is_new & (stored != fingerprints)
+        return (
+            df[is_new],
+            df[is_changed],
+            pd.Series(fingerprints[is_new | is_changed].tolist(), index=ids[is_new | is_changed])
+        )
+
+    def commit(self, fingerprints):
+        """Upsert the fingerprints of written rows, indexed by article id"""
+        self._connection.executemany(
+            "INSERT INTO fingerprints (article_id, fingerprint) VALUES (?, ?) "
+            "ON CONFLICT(article_id) DO UPDATE SET "
+            "fingerprint = excluded.fingerprint, updated_at = CURRENT_TIMESTAMP",
+            list(fingerprints.items())
+        )
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
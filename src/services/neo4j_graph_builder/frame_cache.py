@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import pandas as pd
+
+
+class FrameCache:
+    """
+    Parquet cache of the prepared DataPreprocess frames
+
+    Every cache entry is a directory named after a hash of the raw input
+    files and the preprocess version, holding one Parquet file per frame and
+    a manifest that is written last, so an interrupted write is never read.
+    Frames are read back memory-mapped instead of re-parsing the raw JSON.
+
+    Nested columns (lists, sets, dicts, possibly mixed with scalars) have no
+    single Arrow type; they are stored as JSON text and decoded on load, with
+    sets and tuples coming back as lists.
+    """
+
+    HASH_CHUNK = 1024 * 1024
+
+    def __init__(self, cache_dir='data_outputs/frame_cache'):
+        self.cache_dir = cache_dir
+
+    def key(self, input_paths, version, **options):
+        '''
+        sha1 of the content of every input file, the preprocess version and
+        any option changing the frames (e.g. compact)
+        '''
+        digest = hashlib.sha1()
+        digest.update(json.dumps({'version': version, 'options': options}, sort_keys=True).encode('utf-8'))
+        for path in input_paths:
+            digest.update(path.encode('utf-8'))
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(self.HASH_CHUNK), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _is_nested(series):
+        return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) not in (
+            'string', 'empty', 'boolean', 'integer', 'floating', 'mixed-integer-float'
+        )
+
+    @staticmethod
+    def _encode(value):
+        return json.dumps(value, default=list)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def _manifest_path(self, key):
+        return os.path.join(self._entry_dir(key), 'manifest.json')
+
+    def load(self, key, names=None):
+        '''
+        Frames of the cache entry (only names if given) or None on a miss.
+        Parquet files are memory-mapped rather than read into buffers first
+        '''
+        manifest_path = self._manifest_path(key)
+        if not os.path.exists(manifest_path):
+            return None
+
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        missing = set(names or []) - set(manifest['frames'])
+        if missing:
+            return None
+
+        started = time.perf_counter()
+        frames = {}
+        for name in (names or manifest['frames']):
+            frame = pd.read_parquet(
+                os.path.join(self._entry_dir(key), f"{name}.parquet"),
+                memory_map=True
+            )
+            for column in manifest['json_columns'].get(name, []):
+                frame[column] = [
+                    json.loads(value) if value is not None else None
+                    for value in frame[column]
+                ]
+            frames[name] = frame
+        print(
+            f"Loaded {len(frames)} cached frames from {self._entry_dir(key)} "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return frames
+
+    def store(self, key, frames):
+        """Write every frame of the entry, then the manifest"""
+        entry_dir = self._entry_dir(key)
+        if os.path.exists(entry_dir):
+            shutil.rmtree(entry_dir)
+        os.makedirs(entry_dir)
+
+        json_columns = {}
+        for name, frame in frames.items():
+            nested = [column for column in frame.columns if self._is_nested(frame[column])]
+            if nested:
+                frame = frame.assign(**{
+                    column: frame[column].map(self._encode, na_action='ignore')
+                    for column in nested
+                })
+                json_columns[name] = nested
+            frame.to_parquet(os.path.join(entry_dir, f"{name}.parquet"))
+
+        tmp_path = f"{self._manifest_path(key)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'frames': list(frames),
+                'rows': {name: len(frame) for name, frame in frames.items()},
+                'json_columns': json_columns,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }, f, indent=2)
+        os.replace(tmp_path, self._manifest_path(key))
+        print(f"Cached {len(frames)} frames in {entry_dir}")
+
+    def clear(self):
+        """Remove every cache entry"""
+        if os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
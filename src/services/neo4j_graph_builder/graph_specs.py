@@ -0,0 +1,151 @@
+from typing import NamedTuple
+from src.services.neo4j_graph_builder.columnar import (
+    nested_field,
+    unique_items,
+)
+
+
+class NodeSpec(NamedTuple):
+    """
+    Node label, its id property and the property -> column mapping
+
+    A column is either a column name of the source frame or a callable
+    that derives the whole property column from the frame.
+    """
+
+    label: str
+    id_key: str
+    columns: dict
+
+
+class RelationshipSpec(NamedTuple):
+    """(start_label {start_key})-[relationship_label]->(end_label {end_key})"""
+
+    start_label: str
+    start_key: str
+    relationship_label: str
+    end_label: str
+    end_key: str
+
+    @property
+    def name(self):
+        """Readable name used in progress reports, e.g. Article-WRITTEN_BY-Author"""
+        return f"{self.start_label}-{self.relationship_label}-{self.end_label}"
+
+
+RELATIONSHIP_SPECS = {
+    'article_year': RelationshipSpec(
+        'Article', 'article_id', 'YEAR_PUBLISHED', 'Year', 'year_id'
+    ),
+    'article_title': RelationshipSpec(
+        'Article', 'article_id', 'HAS_TITLE', 'Title', 'title_id'
+    ),
+    'article_abstract': RelationshipSpec(
+        'Article', 'article_id', 'HAS_ABSTRACT', 'Abstract', 'abstract_id'
+    ),
+    'article_topic': RelationshipSpec(
+        'Article', 'article_id', 'HAS_TOPIC', 'Topic', 'topic_id'
+    ),
+    'article_journal': RelationshipSpec(
+        'Article', 'article_id', 'PUBLISHED_IN', 'Journal', 'journal_id'
+    ),
+    'article_author': RelationshipSpec(
+        'Article', 'article_id', 'WRITTEN_BY', 'Author', 'author_id'
+    ),
+    'author_institution': RelationshipSpec(
+        'Author', 'author_id', 'AFFILIATED_TO', 'Institution', 'institution_id'
+    ),
+    'institution_country': RelationshipSpec(
+        'Institution', 'institution_id', 'IS_FROM', 'Country', 'country_id'
+    ),
+    'article_funder': RelationshipSpec(
+        'Article', 'article_id', 'FUNDED_BY', 'Funder', 'funder_id'
+    ),
+    'funder_country': RelationshipSpec(
+        'Funder', 'funder_id', 'LOCATED_IN', 'Country', 'country_id'
+    ),
+    'article_article': RelationshipSpec(
+        'Article', 'article_id', 'CITES', 'Article', 'article_id'
+    ),
+}
+
+
+NODE_SPECS = {
+    'Article': NodeSpec('Article', 'article_id', {
+        'article_id': 'id',
+        'title': 'title',
+        'journal_name': 'journal',
+        'journal_id': 'journal',
+        'publication_year': lambda df: df['publication_year'].astype(int),
+        'doi': 'landing_page_url',
+        'is_retracted': 'is_retracted',
+        'citation_count': 'citation_count',
+        'in_citations': 'incoming_citations',
+        'abstract': 'abstract',
+        'topics': 'topics_name',
+        'funders': lambda df: unique_items(nested_field(df['funders_list'], 1)),
+        'twitter': 'twitter',
+        'reddit': 'reddit',
+    }),
+    'Title': NodeSpec('Title', 'title_id', {
+        'title_id': 'title_id',
+        'text': 'title',
+        'article_id': 'id',
+    }),
+    'Abstract': NodeSpec('Abstract', 'abstract_id', {
+        'abstract_id': 'abstract_id',
+        'text': 'abstract',
+    }),
+    'Topic': NodeSpec('Topic', 'topic_id', {
+        'topic_id': 'topic_id',
+        'text': 'topics_name',
+    }),
+    'Journal': NodeSpec('Journal', 'journal_id', {
+        'journal_id': 'journal_id',
+        'journal_name': 'journal',
+        'issn': 'issn',
+        'sjr_score': 'sjr_score',
+        'h_index': 'h_index',
+        'sjr_best_quartile': 'sjr_best_quartile',
+    }),
+    'Year': NodeSpec('Year', 'year_id', {
+        'year_id': lambda df: df['publication_year'].astype(str),
+        'publication_year': 'publication_year',
+    }),
+    'Author': NodeSpec('Author', 'author_id', {
+        'author_id': lambda df: df['author_id'].astype(str),
+        'author_names': 'author_name',
+        'institution_id': 'institution_id',
+        'institution_name': 'institution_name',
+    }),
+    'Institution': NodeSpec('Institution', 'institution_id', {
+        'institution_id': lambda df: df['institution_id'].astype(str),
+        'institution_name': 'institution_name',
+        'institution_country_code': 'institution_country_code',
+        'country': 'country',
+        'city': 'city',
+        'latitude': 'latitude',
+        'longitude': 'longitude',
+        'institution_type': 'institution_type',
+        'homepage_url': 'homepage_url',
+        'works_count': 'works_count',
+        'cited_by_count': 'cited_by_count',
+        'associated_institution': 'associated_institution_list',
+    }),
+    'Funder': NodeSpec('Funder', 'funder_id', {
+        'funder_id': 'funder_id',
+        'funder_name': 'display_name',
+        'country_code': 'country_code',
+        'description': 'description',
+        'alternate_titles': 'alternate_titles',
+        'homepage': 'homepage_url',
+        'grants_count': 'grants_count',
+        'h_index': lambda df: nested_field(df['summary_stats'], 'h_index'),
+        'i10_index': lambda df: nested_field(df['summary_stats'], 'i10_index'),
+        'cited_by_count': 'cited_by_count',
+    }),
+    'Country': NodeSpec('Country', 'country_id', {
+        'country_id': 'institution_country_code',
+        'country_name': 'country',
+    }),
+}
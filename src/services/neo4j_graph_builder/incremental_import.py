@@ -0,0 +1,101 @@
+import pandas as pd
+from src.services.neo4j_graph_builder.batch_utils import write_batches
+from src.services.neo4j_graph_builder.fingerprint_store import FingerprintStore
+from src.services.neo4j_graph_builder.graph_specs import RELATIONSHIP_SPECS
+from src.services.neo4j_graph_builder.streaming_pipeline import StreamingImporter
+
+
+class IncrementalImporter(StreamingImporter):
+    """
+    Delta refresh on top of the streaming import
+
+    Ids are derived from the OpenAlex id and every node is MERGEd, so a
+    reload upserts instead of duplicating. Each article chunk is compared
+    against the FingerprintStore and only new or changed articles, with
+    their nodes and edges, are written. The outgoing edges of a changed
+    article are dropped first so removed authors/funders do not linger.
+
+    Dropping them includes CITES, which is only rewritten by the citation
+    pass, so fingerprints are held back until that pass has finished: a run
+    stopping in between leaves the articles marked as changed, and the next
+    run rewrites their edges again.
+    """
+
+    def __init__(self, fingerprint_store=None, **kwargs):
+        super().__init__(stable_ids=True, merge=True, **kwargs)
+        self.fingerprint_store = fingerprint_store or FingerprintStore()
+        self.counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+        # New and changed articles, whose outgoing and incoming citations are rewritten
+        self.delta_ids = set()
+        # Fingerprints of the written articles, committed once their citations are written
+        self.pending_fingerprints = []
+
+    def clear_outgoing_relationships(self, article_ids):
+        """Delete the article edges the chunk writer is about to re-create"""
+        relationship_types = '|'.join(
+            RELATIONSHIP_SPECS[name].relationship_label
+            for name in self.ARTICLE_RELATIONSHIPS + ['article_funder', 'article_article']
+        )
+        query = (
+            f"UNWIND $rows AS row "
+            f"MATCH (a:Article {{article_id: row.article_id}})-[r:{relationship_types}]->() "
+            f"DELETE r"
+        )
+        rows = [{'article_id': article_id} for article_id in article_ids]
+        with self.relationship_creator.driver.session() as session:
+            write_batches(
+                session,
+                'Article-outgoing-delete',
+                query,
+                rows,
+                self.relationship_creator.BATCH_SIZE
+            )
+
+    def process_article_chunk(self, chunk):
+        """Write only the new and changed articles of a chunk"""
+        self.article_ids.update(chunk['id'].astype(str))
+        new_df, changed_df, fingerprints = self.fingerprint_store.diff(chunk)
+        self.counts['new'] += len(new_df)
+        self.counts['changed'] += len(changed_df)
+        self.counts['unchanged'] += len(chunk) - len(new_df) - len(changed_df)
+
+        if not changed_df.empty:
+            self.clear_outgoing_relationships(changed_df['id'].astype(str).tolist())
+
+        delta = pd.concat([new_df, changed_df])
+        if not delta.empty:
+            self.delta_ids.update(delta['id'].astype(str))
+            super().process_article_chunk(delta)
+
+        # Only mark rows as imported once their batches, citations included, are committed
+        if not fingerprints.empty:
+            self.pending_fingerprints.append(fingerprints)
+
+    def process_citation_chunk(self, chunk):
+        '''
+        Rewrite the citations of the new and changed articles, and the
+        citations of unchanged articles pointing at them: a reference to a
+        work outside the corpus was dropped when its article was written,
+        and has to be written once that work is added
+        '''
+        citation_df = self.data_preparer.create_citation_df(chunk, corpus_ids=self.article_ids)
+        citation_df = citation_df[
+            citation_df['article_id'].astype(str).isin(self.delta_ids)
+            | citation_df['cited_id'].astype(str).isin(self.delta_ids)
+        ]
+        if not citation_df.empty:
+            self.relationship_creator.create_citation_relationships(citation_df)
+
+    def commit_fingerprints(self):
+        """Mark the articles written by this run as imported"""
+        for fingerprints in self.pending_fingerprints:
+            self.fingerprint_store.commit(fingerprints)
+        self.pending_fingerprints = []
+
+    def run(self, article_path, institution_path=None, funder_path=None):
+        super().run(article_path, institution_path=institution_path, funder_path=funder_path)
+        self.commit_fingerprints()
+        print(
+            f"Incremental import: {self.counts['new']} new, "
+            f"{self.counts['changed']} changed, {self.counts['unchanged']} unchanged articles"
+        )
@@ -0,0 +1,340 @@
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator, GraphRelationshipCreator
+from src.services.neo4j_graph_builder.data_preprocess import DataPreprocess
+from src.services.neo4j_graph_builder.fake_driver import FakeDriver
+from src.services.neo4j_graph_builder.graph_specs import NODE_SPECS
+from src.services.neo4j_graph_builder.submit_queries import NODE_FRAMES, RELATIONSHIP_FRAMES
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def generate_openalex_frames(n_articles, seed=0):
+    '''
+    Synthetic raw frames shaped like the OpenAlex inputs of submit_queries:
+    articles, author/institution records and funders (before reset_index renaming)
+    '''
+    rng = np.random.default_rng(seed)
+    n_journals = max(n_articles // 50, 1)
+    n_authors = max(n_articles * 2, 1)
+    n_institutions = max(n_articles // 20, 1)
+    n_funders = max(n_articles // 200, 1)
+    countries = np.array(['US', 'GB', 'DE', 'JP', 'FR', 'CN', 'VN', 'NL'])
+    country_names = np.array([
+        'United States', 'United Kingdom', 'Germany', 'Japan',
+        'France', 'China', 'Vietnam', 'Netherlands'
+    ])
+
+    article_ids = np.char.add('W', np.arange(n_articles).astype(str))
+    journal_index = rng.integers(0, n_journals, n_articles)
+    author_counts = rng.integers(1, 8, n_articles)
+    author_index = rng.integers(0, n_authors, author_counts.sum())
+    author_offsets = np.concatenate([[0], np.cumsum(author_counts)])
+    funder_counts = rng.integers(0, 3, n_articles)
+    funder_index = rng.integers(0, n_funders, funder_counts.sum())
+    funder_offsets = np.concatenate([[0], np.cumsum(funder_counts)])
+    reference_counts = rng.integers(0, 20, n_articles)
+    reference_index = rng.integers(0, n_articles, reference_counts.sum())
+    reference_offsets = np.concatenate([[0], np.cumsum(reference_counts)])
+
+    author_info = [
+        [
+            [f"A{a}", f"Author {a}", f"I{a % n_institutions}", f"Institution {a % n_institutions}"]
+            for a in author_index[author_offsets[i]:author_offsets[i + 1]]
+        ]
+        for i in range(n_articles)
+    ]
+    funders_list = [
+        [
+            [f"F{f}" for f in funder_index[funder_offsets[i]:funder_offsets[i + 1]]],
+            [f"Funder {f}" for f in funder_index[funder_offsets[i]:funder_offsets[i + 1]]],
+        ]
+        for i in range(n_articles)
+    ]
+    referenced_works = [
+        [f"https://openalex.org/W{r}" for r in reference_index[reference_offsets[i]:reference_offsets[i + 1]]]
+        for i in range(n_articles)
+    ]
+
+    articles = pd.DataFrame({
+        'id': article_ids,
+        'title': np.char.add('Synthetic title ', article_ids),
+        'journal': np.char.add('Journal ', journal_index.astype(str)),
+        'issn': np.char.add('0000-', journal_index.astype(str)),
+        'sjr_score': rng.random(n_articles) * 10,
+        'h_index': rng.integers(1, 400, n_articles),
+        'sjr_best_quartile': rng.choice(['Q1', 'Q2', 'Q3', 'Q4'], n_articles),
+        'publication_year': rng.integers(1990, 2025, n_articles),
+        'landing_page_url': np.char.add('https://doi.org/10.0000/', article_ids),
+        'is_retracted': rng.random(n_articles) < 0.001,
+        'citation_count': rng.integers(0, 5000, n_articles),
+        'incoming_citations': [[] for _ in range(n_articles)],
+        'abstract': np.char.add('Synthetic abstract of ', article_ids),
+        'topics_name': rng.choice(['Biology', 'Chemistry', 'Physics', 'Medicine'], n_articles),
+        'funders_list': funders_list,
+        'twitter': rng.integers(0, 50, n_articles),
+        'reddit': rng.integers(0, 10, n_articles),
+        'primary_location': [
+            {'source': {'id': f"https://openalex.org/S{j}"}} for j in journal_index
+        ],
+        'author_info': author_info,
+        'referenced_works': referenced_works,
+    })
+
+    n_records = min(n_authors, n_articles * 2)
+    author_ids = np.arange(n_records)
+    institution_index = author_ids % n_institutions
+    country_index = institution_index % len(countries)
+    institutions = pd.DataFrame({
+        'author_id': np.char.add('A', author_ids.astype(str)),
+        'author_name': np.char.add('Author ', author_ids.astype(str)),
+        'oa_extract': [None] * n_records,
+        'institution_id': np.char.add('I', institution_index.astype(str)),
+        'institution_name': np.char.add('Institution ', institution_index.astype(str)),
+        'institution_country_code': countries[country_index],
+        'country': country_names[country_index],
+        'city': rng.choice(['Hanoi', 'Tokyo', 'Berlin', 'Boston'], n_records),
+        'latitude': rng.random(n_records) * 180 - 90,
+        'longitude': rng.random(n_records) * 360 - 180,
+        'institution_type': rng.choice(['education', 'company', 'facility'], n_records),
+        'homepage_url': np.char.add('https://example.org/', institution_index.astype(str)),
+        'works_count': rng.integers(0, 100_000, n_records),
+        'cited_by_count': rng.integers(0, 1_000_000, n_records),
+        'associated_institution': [[] for _ in range(n_records)],
+    })
+
+    funder_ids = np.arange(n_funders)
+    funders = pd.DataFrame({
+        'index': np.char.add('F', funder_ids.astype(str)),
+        'display_name': np.char.add('Funder ', funder_ids.astype(str)),
+        'country_code': countries[funder_ids % len(countries)],
+        'description': ['Synthetic funder'] * n_funders,
+        'alternate_titles': [[] for _ in range(n_funders)],
+        'homepage_url': np.char.add('https://funder.example.org/', funder_ids.astype(str)),
+        'grants_count': rng.integers(0, 1000, n_funders),
+        'summary_stats': [
+            {'h_index': int(h), 'i10_index': int(h) * 3}
+            for h in rng.integers(0, 300, n_funders)
+        ],
+        'cited_by_count': rng.integers(0, 1_000_000, n_funders),
+    })
+
+    return {'articles': articles, 'institutions': institutions, 'funders': funders}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class IngestionBenchmark:
+    """
+    Times every phase of the neo4j_graph_builder pipeline against a FakeDriver
+
+    preprocessing: DataPreprocess.create_*_df
+    query building: every create_*_nodes, create_relationship_* and create_pairs_* builder
+    submission: the batched UNWIND writers, recorded by the fake driver
+    """
+
+    def __init__(self, n_articles, batch_size=None, seed=0, compact=False):
+        self.n_articles = n_articles
+        self.batch_size = batch_size or GraphNodeCreator.BATCH_SIZE
+        self.seed = seed
+        self.compact = compact
+        self.driver = FakeDriver()
+        self.data_preparer = DataPreprocess(compact=compact)
+        self.node_creator = GraphNodeCreator(driver=self.driver)
+        self.relationship_creator = GraphRelationshipCreator(driver=self.driver)
+        self.steps = []
+
+    def _timed(self, phase, name, function, *args):
+        started = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - started
+        rows = len(result[1]) if isinstance(result, tuple) else len(result)
+        self.steps.append({
+            'phase': phase,
+            'step': name,
+            'rows': rows,
+            'seconds': elapsed,
+            'rows_per_second': rows / elapsed if elapsed > 0 else None,
+        })
+        return result
+
+    def preprocess(self, raw):
+        dp = self.data_preparer
+        articles = self._timed('preprocessing', 'create_article_df', dp.create_article_df, raw['articles'])
+        institutions = raw['institutions']
+        funder_df = self._timed('preprocessing', 'create_funder_df', dp.create_funder_df, raw['funders'])
+        return {
+            'article': articles,
+            'date': self._timed('preprocessing', 'create_date_df', dp.create_date_df, articles),
+            'journal': self._timed('preprocessing', 'create_journal_df', dp.create_journal_df, articles),
+            'author': self._timed('preprocessing', 'create_author_df', dp.create_author_df, articles),
+            'institution': self._timed(
+                'preprocessing', 'create_institution_df', dp.create_institution_df, institutions
+            ),
+            'country': self._timed('preprocessing', 'create_country_df', dp.create_country_df, institutions),
+            'funder': funder_df,
+            'article_author': self._timed(
+                'preprocessing', 'create_article_author_df', dp.create_article_author_df, articles
+            ),
+            'author_institution': self._timed(
+                'preprocessing', 'create_author_institution_df', dp.create_author_institution_df, institutions
+            ),
+            'article_funder': self._timed(
+                'preprocessing', 'create_article_funder_df', dp.create_article_funder_df, articles
+            ),
+            'funder_country': self._timed(
+                'preprocessing', 'create_funder_country_df', dp.create_funder_country_df, funder_df
+            ),
+            'citation': self._timed(
+                'preprocessing',
+                'create_citation_df',
+                lambda df: dp.create_citation_df(df, corpus_ids=set(df['id'].astype(str))),
+                articles
+            ),
+        }
+
+    def build(self, frames):
+        node_rows = {}
+        for label, frame_name in NODE_FRAMES.items():
+            _queries, properties = self._timed(
+                'query_building',
+                f"create_node_rows[{label}]",
+                self.node_creator.create_node_rows,
+                NODE_SPECS[label],
+                frames[frame_name]
+            )
+            node_rows[label] = properties
+
+        relationship_pairs = {}
+        for name, frame_name in RELATIONSHIP_FRAMES.items():
+            relationship_pairs[name] = self._timed(
+                'query_building',
+                f"create_pairs_{name}",
+                getattr(self.relationship_creator, f"create_pairs_{name}"),
+                frames[frame_name]
+            )
+            self._timed(
+                'query_building',
+                f"create_relationship_{name}",
+                getattr(self.relationship_creator, f"create_relationship_{name}"),
+                frames[frame_name]
+            )
+        return node_rows, relationship_pairs
+
+    def submit(self, node_rows, relationship_pairs):
+        for label, properties in node_rows.items():
+            self._timed(
+                'submission',
+                f"create_nodes_batched[{label}]",
+                lambda rows: self.node_creator.create_nodes_batched(
+                    label, rows, batch_size=self.batch_size
+                ) or rows,
+                properties
+            )
+        for name, pairs in relationship_pairs.items():
+            self._timed(
+                'submission',
+                f"create_relationships_batched[{name}]",
+                lambda rows: self.relationship_creator.create_relationships_batched(
+                    name, rows, batch_size=self.batch_size
+                ) or rows,
+                pairs
+            )
+
+    def run(self):
+        started = time.perf_counter()
+        raw = generate_openalex_frames(self.n_articles, seed=self.seed)
+        generation_seconds = time.perf_counter() - started
+
+        frames = self.preprocess(raw)
+        node_rows, relationship_pairs = self.build(frames)
+        self.submit(node_rows, relationship_pairs)
+
+        phases = {}
+        for step in self.steps:
+            phases[step['phase']] = phases.get(step['phase'], 0.0) + step['seconds']
+        submission_seconds = phases.get('submission', 0.0)
+        statements = len(self.driver.statements)
+        rows_written = self.driver.rows_written('UNWIND')
+
+        return {
+            'n_articles': self.n_articles,
+            'batch_size': self.batch_size,
+            'compact': self.compact,
+            'generation_seconds': generation_seconds,
+            'phase_seconds': phases,
+            'rows_written': rows_written,
+            'statements': statements,
+            'rows_per_second': rows_written / submission_seconds if submission_seconds else None,
+            'statements_per_second': statements / submission_seconds if submission_seconds else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'frame_memory_mb': self.data_preparer.memory_report,
+            'steps': self.steps,
+        }
+
+
+def _run_size(n_articles, batch_size, seed, compact):
+    # Silence per-batch progress output, only the JSON report goes to stdout
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return IngestionBenchmark(n_articles, batch_size=batch_size, seed=seed, compact=compact).run()
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes, batch_size=None, seed=0, compact=False):
+    '''
+    Run one benchmark per size, each in a fresh process so peak RSS is per size
+    '''
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for n_articles in sizes:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(_run_size, (n_articles, batch_size, seed, compact)))
+    return {
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the OpenAlex ingestion pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--batch-size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compact', action='store_true', help="preprocess with DataPreprocess(compact=True)")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        args.sizes, batch_size=args.batch_size, seed=args.seed, compact=args.compact
+    )
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Benchmark report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import threading
+import pandas as pd
+
+
+class NodeIdMap:
+    """
+    elementId of every node written by this load, keyed by (label, business id)
+
+    Filled from the RETURN of the node batches, so relationship batches can
+    address their endpoints by elementId and the server does no property
+    lookups while creating edges. elementIds are only guaranteed for the
+    lifetime of the node and may be reused afterwards: a label's entries are
+    cleared when its nodes are written again, and the relationship statement
+    checks label and business id of every node it seeks, falling back to a
+    property lookup for stale entries.
+    """
+
+    def __init__(self):
+        self._ids = {}
+
+    def add(self, label, records):
+        """Store (business id, elementId) records of one batch"""
+        self._ids.setdefault(label, {}).update(
+            (str(business_id), element_id) for business_id, element_id in records
+        )
+
+    def resolve(self, label, business_ids):
+        """elementIds aligned with business_ids, None where a node is unknown"""
+        ids = self._ids.get(label, {})
+        return [ids.get(str(business_id)) for business_id in business_ids]
+
+    def resolve_series(self, label, series):
+        """Vectorized resolve of a column, NaN where a node is unknown"""
+        return series.astype(str).map(self._ids.get(label, {}))
+
+    def clear(self, label=None):
+        """Drop the entries of label, or of every label"""
+        if label is None:
+            self._ids.clear()
+        else:
+            self._ids.pop(label, None)
+
+    def counts(self):
+        return {label: len(ids) for label, ids in self._ids.items()}
+
+
+class SqliteNodeIdMap(NodeIdMap):
+    """
+    NodeIdMap kept in a local SQLite file instead of dicts, for label sets
+    too large to hold in memory (Article, Author)
+    """
+
+    # sqlite limits the number of bound parameters per statement
+    LOOKUP_BATCH = 900
+
+    def __init__(self, path='data_outputs/node_ids.sqlite'):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        # Node stages may run concurrently, one lock serializes the connection
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS node_ids ("
+            "label TEXT NOT NULL, business_id TEXT NOT NULL, element_id TEXT NOT NULL, "
+            "PRIMARY KEY (label, business_id)) WITHOUT ROWID"
+        )
+        self._connection.commit()
+
+    def add(self, label, records):
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO node_ids (label, business_id, element_id) VALUES (?, ?, ?)",
+                [(label, str(business_id), element_id) for business_id, element_id in records]
+            )
+            self._connection.commit()
+
+    def resolve(self, label, business_ids):
+        keys = [str(business_id) for business_id in business_ids]
+        found = {}
+        for start in range(0, len(keys), self.LOOKUP_BATCH):
+            chunk = keys[start:start + self.LOOKUP_BATCH]
+            placeholders = ', '.join('?' * len(chunk))
+            with self._lock:
+                found.update(self._connection.execute(
+                    f"SELECT business_id, element_id FROM node_ids "
+                    f"WHERE label = ? AND business_id IN ({placeholders})",
+                    [label, *chunk]
+                ).fetchall())
+        return [found.get(key) for key in keys]
+
+    def resolve_series(self, label, series):
+        return pd.Series(self.resolve(label, series.tolist()), index=series.index, dtype=object)
+
+    def clear(self, label=None):
+        with self._lock:
+            if label is None:
+                self._connection.execute("DELETE FROM node_ids")
+            else:
+                self._connection.execute("DELETE FROM node_ids WHERE label = ?", (label,))
+            self._connection.commit()
+
+    def counts(self):
+        with self._lock:
+            return dict(self._connection.execute(
+                "SELECT label, COUNT(*) FROM node_ids GROUP BY label"
+            ).fetchall())
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,119 @@
+import os
+import time
+from dotenv import load_dotenv
+from src.database_configs.connection_registry import ConnectionRegistry
+from src.services.neo4j_graph_builder.graph_specs import NODE_SPECS, RELATIONSHIP_SPECS
+
+load_dotenv()
+
+
+class SchemaManager:
+    """
+    Constraints and indexes needed by the relationship builders
+
+    Every MATCH in a relationship statement looks an endpoint up by its id
+    property. Without an index on (label, property) that lookup is a label scan,
+    so the schema has to be in place before nodes and edges are imported.
+    """
+
+    ONLINE_TIMEOUT = int(os.getenv("NEO4J_SCHEMA_TIMEOUT", "300"))
+
+    def __init__(self, unique=True, driver=None):
+        self._driver = driver
+        self.unique = unique
+
+    @property
+    def driver(self):
+        """Neo4j driver, the process-wide pool unless one was injected"""
+        if self._driver is None:
+            self._driver = ConnectionRegistry.get_driver()
+        return self._driver
+
+    def lookup_keys(self):
+        """(label, property) pairs matched on by the relationship builders"""
+        keys = []
+        for spec in RELATIONSHIP_SPECS.values():
+            for key in [
+                (spec.start_label, spec.start_key),
+                (spec.end_label, spec.end_key)
+            ]:
+                if key not in keys:
+                    keys.append(key)
+        return keys
+
+    def schema_name(self, label, key, kind):
+        """Deterministic schema object name so re-runs are idempotent"""
+        return f"{label.lower()}_{key}_{kind}"
+
+    def create_schema_queries(self):
+        '''
+        Create the schema statements, one per lookup key.
+        A label's id key gets a uniqueness constraint (backed by a range index),
+        any other lookup key gets a plain range index
+        '''
+        queries = {}
+        for label, key in self.lookup_keys():
+            id_key = NODE_SPECS[label].id_key if label in NODE_SPECS else None
+            if self.unique and key == id_key:
+                name = self.schema_name(label, key, 'unique')
+                queries[name] = (
+                    f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+                    f"FOR (n:{label}) REQUIRE n.{key} IS UNIQUE"
+                )
+            else:
+                name = self.schema_name(label, key, 'range')
+                queries[name] = (
+                    f"CREATE RANGE INDEX {name} IF NOT EXISTS "
+                    f"FOR (n:{label}) ON (n.{key})"
+                )
+        return queries
+
+    def ensure_schema(self):
+        """Create missing constraints and indexes, returns the schema object names"""
+        queries = self.create_schema_queries()
+        with self.driver.session() as session:
+            for name, query in queries.items():
+                session.run(query).consume()
+                print(f"Schema ensured: {name}")
+        return list(queries.keys())
+
+    def verify_online(self, names, timeout=None):
+        '''
+        Poll SHOW INDEXES until every named index is ONLINE.
+        Raises RuntimeError when an index FAILED or the timeout is reached
+        '''
+        timeout = timeout or self.ONLINE_TIMEOUT
+        deadline = time.monotonic() + timeout
+        query = (
+            "SHOW INDEXES YIELD name, state, populationPercent "
+            "WHERE name IN $names RETURN name, state, populationPercent"
+        )
+
+        while True:
+            with self.driver.session() as session:
+                records = session.run(query, names=names).data()
+
+            states = {record['name']: record for record in records}
+            missing = [name for name in names if name not in states]
+            failed = [name for name, record in states.items() if record['state'] == 'FAILED']
+            pending = [
+                name for name, record in states.items()
+                if record['state'] != 'ONLINE'
+            ]
+
+            if failed:
+                raise RuntimeError(f"Index population failed: {failed}")
+            if not missing and not pending:
+                print(f"All {len(names)} schema indexes are ONLINE")
+                return states
+            if time.monotonic() > deadline:
+                raise RuntimeError(
+                    f"Indexes not ONLINE after {timeout}s, "
+                    f"missing: {missing}, pending: {pending}"
+                )
+            time.sleep(1)
+
+    def bootstrap(self):
+        """Schema stage to run before node import"""
+        names = self.ensure_schema()
+        return self.verify_online(names)
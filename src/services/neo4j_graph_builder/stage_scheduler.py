@@ -0,0 +1,123 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+
+class Stage(NamedTuple):
+    """One unit of an import: a callable and the names of the stages it waits for"""
+
+    name: str
+    run: object
+    depends_on: tuple = ()
+
+
+class StageScheduler:
+    """
+    Runs a DAG of import stages on a thread pool
+
+    A stage starts as soon as every stage it depends on has finished, with
+    at most max_concurrency stages running at once. Ready stages start in
+    the order they were added, so max_concurrency=1 runs them one after
+    another in that order. When a stage fails no further stage is started;
+    the running ones are awaited and the first error is raised.
+    """
+
+    def __init__(self, max_concurrency=1):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        self.max_concurrency = max_concurrency
+        self.stages = {}
+        self.timeline = []
+
+    def add(self, name, run, depends_on=()):
+        if name in self.stages:
+            raise ValueError(f"Stage {name} is already scheduled")
+        self.stages[name] = Stage(name, run, tuple(depends_on))
+
+    def validate(self):
+        """Raise ValueError on unknown dependencies or dependency cycles"""
+        for stage in self.stages.values():
+            unknown = [dep for dep in stage.depends_on if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages {unknown}")
+
+        visiting, done = set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name, [])
+
+    def _run_stage(self, stage, started):
+        begin = time.perf_counter()
+        try:
+            stage.run()
+        finally:
+            end = time.perf_counter()
+            self.timeline.append({
+                'stage': stage.name,
+                'start': begin - started,
+                'end': end - started,
+                'seconds': end - begin,
+            })
+
+    def run(self):
+        """Run every stage, returns the timeline"""
+        self.validate()
+        self.timeline = []
+        pending = list(self.stages)
+        finished = set()
+        running = {}
+        error = None
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while pending or running:
+                if error is None:
+                    for name in list(pending):
+                        if len(running) >= self.max_concurrency:
+                            break
+                        if all(dep in finished for dep in self.stages[name].depends_on):
+                            pending.remove(name)
+                            future = executor.submit(self._run_stage, self.stages[name], started)
+                            running[future] = name
+                elif not running:
+                    break
+
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                        print(f"[scheduler] stage {name} failed: {future.exception()!r}")
+                    else:
+                        finished.add(name)
+
+        if error is not None:
+            raise error
+        return self.timeline
+
+    def print_timeline(self, width=50):
+        """Start, end and duration of every stage with a bar over the whole run"""
+        if not self.timeline:
+            return
+        total = max(entry['end'] for entry in self.timeline) or 1e-9
+        name_width = max(len(entry['stage']) for entry in self.timeline)
+        print(f"Stage timeline ({total:.2f}s, up to {self.max_concurrency} concurrent stages):")
+        for entry in sorted(self.timeline, key=lambda entry: entry['start']):
+            begin = int(entry['start'] / total * width)
+            length = max(min(int(entry['end'] / total * width), width) - begin, 1)
+            bar = ' ' * begin + '#' * length
+            print(
+                f"  {entry['stage']:<{name_width}} {entry['start']:>8.2f}s -> {entry['end']:>8.2f}s "
+                f"{entry['seconds']:>8.2f}s |{bar:<{width}}|"
+            )
@@ -0,0 +1,107 @@
+from src.database_configs.connection_registry import ConnectionRegistry
+
+# Operators reading every node (of a label) instead of seeking through an index
+SCAN_OPERATORS = ('AllNodesScan', 'NodeByLabelScan')
+
+
+def walk_plan(plan):
+    """Yield every operator of a PROFILE/EXPLAIN plan tree, depth first"""
+    if not plan:
+        return
+    yield plan
+    for child in plan.get('children', []):
+        yield from walk_plan(child)
+
+
+def operator_name(operator):
+    """'NodeIndexSeek@neo4j' -> 'NodeIndexSeek'"""
+    return operator.get('operatorType', '').split('@')[0]
+
+
+class StatementProfiler:
+    """
+    PROFILE (or EXPLAIN) of the generated ingestion statements
+
+    Every statement shape runs once with a sample batch inside an explicit
+    transaction that is rolled back, so nothing is written. The plan is
+    reduced to db hits, rows and the operators used; a statement whose plan
+    contains a label or all-nodes scan is flagged, which usually means the
+    MATCH key has no index or constraint.
+
+    PROFILE executes the statement, so a CREATE of rows that are already
+    loaded fails on the uniqueness constraints; callers check has_data and
+    profile the MERGE form for labels that hold data.
+    """
+
+    def __init__(self, driver=None, explain=False):
+        self._driver = driver
+        self.explain = explain
+        self.reports = []
+
+    @property
+    def driver(self):
+        """Neo4j driver, the process-wide pool unless one was injected"""
+        if self._driver is None:
+            self._driver = ConnectionRegistry.get_driver()
+        return self._driver
+
+    def has_data(self, label):
+        """True when at least one node of label exists"""
+        with self.driver.session() as session:
+            return bool(session.run(f"MATCH (n:{label}) RETURN 1 AS found LIMIT 1").data())
+
+    def summarize(self, name, plan):
+        operators = list(walk_plan(plan))
+        scans = [
+            f"{operator_name(operator)}({operator.get('args', {}).get('Details', '')})"
+            for operator in operators
+            if operator_name(operator) in SCAN_OPERATORS
+        ]
+        return {
+            'statement': name,
+            'operators': [operator_name(operator) for operator in operators],
+            'db_hits': sum(operator.get('dbHits', 0) for operator in operators),
+            'rows': plan.get('rows', 0) if plan else 0,
+            'scans': scans,
+        }
+
+    def profile(self, name, query, rows):
+        '''
+        PROFILE/EXPLAIN query with the sample rows in a rolled-back transaction
+        and return its report
+        '''
+        prefix = 'EXPLAIN' if self.explain else 'PROFILE'
+        with self.driver.session() as session:
+            tx = session.begin_transaction()
+            try:
+                summary = tx.run(f"{prefix} {query}", rows=rows).consume()
+            finally:
+                tx.rollback()
+
+        plan = None
+        if summary is not None:
+            plan = summary.plan if self.explain else summary.profile
+        report = self.summarize(name, plan)
+        report['plan_returned'] = plan is not None
+        self.reports.append(report)
+
+        if report['scans']:
+            print(
+                f"WARNING [{name}] plan scans instead of seeking: {', '.join(report['scans'])}. "
+                f"Check the index / uniqueness constraint on its lookup keys (SchemaManager.bootstrap)"
+            )
+        return report
+
+    def print_report(self):
+        """db hits, rows and the operators of every profiled statement"""
+        mode = 'EXPLAIN' if self.explain else 'PROFILE'
+        print(f"{mode} of the ingestion statements:")
+        for report in self.reports:
+            if not report['plan_returned']:
+                print(f"  {report['statement']:<40} no plan returned")
+                continue
+            flag = 'SCAN' if report['scans'] else 'ok'
+            print(
+                f"  {report['statement']:<40} {flag:<4} {report['db_hits']:>10} db hits "
+                f"{report['rows']:>8} rows  {' > '.join(report['operators'])}"
+            )
@@ -0,0 +1,196 @@
+import os
+import time
+import pandas as pd
+from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator, GraphRelationshipCreator
+from src.services.neo4j_graph_builder.data_preprocess import DataPreprocess
+from src.services.neo4j_graph_builder.graph_specs import NODE_SPECS
+
+
+class DimensionTracker:
+    """
+    Ids of dimension nodes already written by earlier chunks
+
+    Dimensions (years, journals, countries, institutions) repeat across
+    chunks; only their ids are kept, so memory grows with the number of
+    distinct dimension values, not with the corpus.
+    """
+
+    def __init__(self):
+        self._seen = {}
+
+    def filter_new(self, label, frame, id_column):
+        """Rows of frame whose id was not written yet, and mark them as written"""
+        seen = self._seen.setdefault(label, set())
+        ids = frame[id_column].astype(str)
+        new_rows = frame[~ids.isin(seen)].drop_duplicates(subset=[id_column])
+        seen.update(new_rows[id_column].astype(str).tolist())
+        return new_rows
+
+    def counts(self):
+        """Number of distinct ids written per label"""
+        return {label: len(ids) for label, ids in self._seen.items()}
+
+
+class StreamingImporter:
+    """
+    Chunked OpenAlex import
+
+    The article and institution files are read as JSON Lines in chunks of
+    chunk_size rows. Every chunk is preprocessed, turned into node rows and
+    relationship pairs, and written before the next chunk is read, so peak
+    memory depends on the chunk size instead of the corpus size.
+    """
+
+    CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "10000"))
+    ARTICLE_RELATIONSHIPS = [
+        'article_year', 'article_title', 'article_abstract',
+        'article_topic', 'article_journal', 'article_author'
+    ]
+    # Article relationships written from an edge table instead of the article frame
+    ARTICLE_LINK_TABLES = ['article_author', 'article_funder']
+
+    def __init__(
+        self,
+        chunk_size=None,
+        data_preparer=None,
+        node_creator=None,
+        relationship_creator=None,
+        stable_ids=False,
+        merge=False
+    ):
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.stable_ids = stable_ids
+        self.merge = merge
+        self.data_preparer = data_preparer or DataPreprocess()
+        self.node_creator = node_creator or GraphNodeCreator()
+        self.relationship_creator = relationship_creator or GraphRelationshipCreator()
+        self.dimensions = DimensionTracker()
+        # Ids of every article read, CITES edges only point inside the corpus
+        self.article_ids = set()
+        # LOCATED_IN edges of the funders, written once the institutions stage created the countries
+        self.funder_country_df = None
+
+    def iter_chunks(self, path):
+        """Yield dataframes of at most chunk_size rows from a JSON Lines file"""
+        with pd.read_json(path, lines=True, chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                yield chunk
+
+    def write_nodes(self, label, frame, merge=False):
+        if frame.empty:
+            return
+        _queries, properties = self.node_creator.create_node_rows(NODE_SPECS[label], frame)
+        self.node_creator.create_nodes_batched(label, properties, merge=merge or self.merge)
+
+    def write_relationships(self, name, frame):
+        if frame.empty:
+            return
+        pairs = getattr(self.relationship_creator, f"create_pairs_{name}")(frame)
+        self.relationship_creator.create_relationships_batched(name, pairs)
+
+    def process_article_chunk(self, chunk):
+        """Preprocess and write one chunk of articles with its nodes and edges"""
+        self.article_ids.update(chunk['id'].astype(str))
+        df = self.data_preparer.create_article_df(chunk, stable_ids=self.stable_ids)
+
+        date_df = self.dimensions.filter_new(
+            'Year', self.data_preparer.create_date_df(df), 'year_id'
+        )
+        journal_df = self.dimensions.filter_new(
+            'Journal', self.data_preparer.create_journal_df(df), 'journal_id'
+        )
+        author_df = self.data_preparer.create_author_df(df)
+        link_tables = {
+            'article_author': self.data_preparer.create_article_author_df(df),
+            'article_funder': self.data_preparer.create_article_funder_df(df),
+        }
+
+        for label in ['Article', 'Title', 'Abstract', 'Topic']:
+            self.write_nodes(label, df)
+        self.write_nodes('Year', date_df)
+        self.write_nodes('Journal', journal_df)
+        # Authors repeat across chunks and are too many to track, MERGE keeps them unique
+        self.write_nodes('Author', author_df, merge=True)
+
+        for name in self.ARTICLE_RELATIONSHIPS:
+            if name not in link_tables:
+                self.write_relationships(name, df)
+        for name in self.ARTICLE_LINK_TABLES:
+            self.write_relationships(name, link_tables[name])
+
+    def process_institution_chunk(self, chunk):
+        """Preprocess and write one chunk of author/institution records"""
+        institution_df = self.dimensions.filter_new(
+            'Institution',
+            self.data_preparer.create_institution_df(chunk),
+            'institution_id'
+        )
+        country_df = self.dimensions.filter_new(
+            'Country',
+            self.data_preparer.create_country_df(chunk),
+            'institution_country_code'
+        )
+        author_institution_df = self.data_preparer.create_author_institution_df(chunk)
+
+        self.write_nodes('Institution', institution_df)
+        self.write_nodes('Country', country_df)
+        self.write_relationships('author_institution', author_institution_df)
+        self.write_relationships('institution_country', institution_df)
+
+    def process_citation_chunk(self, chunk):
+        '''
+        Write the CITES edges of one chunk of articles.
+        Runs as a second pass over the article file, once every Article node exists
+        '''
+        citation_df = self.data_preparer.create_citation_df(chunk, corpus_ids=self.article_ids)
+        if not citation_df.empty:
+            self.relationship_creator.create_citation_relationships(citation_df)
+
+    def process_funders(self, funder_path):
+        '''
+        Funders are a small dimension file, written in one go.
+        Their LOCATED_IN edges are kept for process_funder_countries
+        '''
+        funder_data = pd.read_json(funder_path, orient='index').reset_index()
+        funder_df = self.data_preparer.create_funder_df(funder_data)
+        self.funder_country_df = self.data_preparer.create_funder_country_df(funder_df)
+
+        self.write_nodes('Funder', funder_df)
+
+    def process_funder_countries(self):
+        """Write the LOCATED_IN edges of the funders, once the Country nodes exist"""
+        if self.funder_country_df is not None:
+            self.write_relationships('funder_country', self.funder_country_df)
+            self.funder_country_df = None
+
+    def _run_stage(self, name, path, process_chunk):
+        total = 0
+        started = time.perf_counter()
+        for chunk_number, chunk in enumerate(self.iter_chunks(path), start=1):
+            chunk_started = time.perf_counter()
+            process_chunk(chunk)
+            total += len(chunk)
+            print(
+                f"[{name}] chunk {chunk_number}: {len(chunk)} rows "
+                f"in {time.perf_counter() - chunk_started:.2f}s, {total} rows so far"
+            )
+        print(f"[{name}] {total} rows in {time.perf_counter() - started:.2f}s")
+        return total
+
+    def run(self, article_path, institution_path=None, funder_path=None):
+        '''
+        Stream every input through preprocessing and the writers.
+        Funders go first so FUNDED_BY edges of every article chunk find their end node,
+        citations are a second pass over the articles so CITES edges find the cited article,
+        institutions go last so AFFILIATED_TO edges find the authors, and the funders'
+        LOCATED_IN edges follow them because Country nodes come from the institutions
+        '''
+        if funder_path:
+            self.process_funders(funder_path)
+        self._run_stage('articles', article_path, self.process_article_chunk)
+        self._run_stage('citations', article_path, self.process_citation_chunk)
+        if institution_path:
+            self._run_stage('institutions', institution_path, self.process_institution_chunk)
+        self.process_funder_countries()
+
+        print(f"Distinct dimension nodes written: {self.dimensions.counts()}")
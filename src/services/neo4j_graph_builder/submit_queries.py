@@ -1,28 +1,81 @@
+import argparse
+import asyncio
+from functools import partial
 import pandas as pd
+from src.database_configs.connection_registry import ConnectionRegistry
 from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator, GraphRelationshipCreator
 from src.services.neo4j_graph_builder.data_preprocess import DataPreprocess
+from src.services.neo4j_graph_builder.schema_manager import SchemaManager
+from src.services.neo4j_graph_builder.bulk_export import BulkImportExporter
+from src.services.neo4j_graph_builder.streaming_pipeline import StreamingImporter
+from src.services.neo4j_graph_builder.incremental_import import IncrementalImporter
+from src.services.neo4j_graph_builder.fingerprint_store import FingerprintStore
+from src.services.neo4j_graph_builder.checkpoint import CheckpointManifest
+from src.services.neo4j_graph_builder.async_writer import AsyncGraphWriter
+from src.services.neo4j_graph_builder.columnar import FrameRows, unique_by
+from src.services.neo4j_graph_builder.node_id_map import NodeIdMap, SqliteNodeIdMap
+from src.services.neo4j_graph_builder.parallel_writer import ParallelGraphWriter
+from src.services.neo4j_graph_builder.frame_cache import FrameCache
+from src.services.neo4j_graph_builder.graph_specs import NODE_SPECS, RELATIONSHIP_SPECS
+from src.services.neo4j_graph_builder.stage_scheduler import StageScheduler
+from src.services.neo4j_graph_builder.statement_profiler import StatementProfiler
 
+# Raw input files of prepare_frames
+INPUT_FILES = {
+    'metadata': 'meta data file',
+    'articles': 'your file here',
+    'institutions': 'institution data ',
+    'funders': 'funder data',
+}
 
-def main():
-    # Instantiate some classes
-    data_preparer = DataPreprocess()
-    node_creator = GraphNodeCreator()
-    relationship_creator = GraphRelationshipCreator()
+# Node label => prepared dataframe it is built from
+NODE_FRAMES = {
+    'Article': 'article',
+    'Year': 'date',
+    'Title': 'article',
+    'Abstract': 'article',
+    'Topic': 'article',
+    'Journal': 'journal',
+    'Author': 'author',
+    'Institution': 'institution',
+    'Country': 'country',
+    'Funder': 'funder',
+}
+
+# Relationship spec => prepared dataframe its pairs are built from
+RELATIONSHIP_FRAMES = {
+    'article_year': 'article',
+    'article_title': 'article',
+    'article_abstract': 'article',
+    'article_topic': 'article',
+    'article_journal': 'article',
+    'article_author': 'article_author',
+    'author_institution': 'author_institution',
+    'institution_country': 'institution',
+    'article_funder': 'article_funder',
+    'funder_country': 'funder_country',
+    'article_article': 'citation',
+}
+
+
+def prepare_frames(data_preparer):
+    """Read the raw files and prepare every dataframe the builders need"""
 
     # -------Prepare some dataframes-------#
     # Data for Article
     df = None
-    data = pd.read_csv('meta data file', index_col=[0])
-    df = pd.read_json('your file here')
+    data = pd.read_csv(INPUT_FILES['metadata'], index_col=[0])
+    df = pd.read_json(INPUT_FILES['articles'])
     print(df.shape)
 
-    # Generate unique UUIDs
-    df['uuid'] = data_preparer.generate_unique_uuids(len(df))
+    # Generate UUIDs and the title/abstract/topic ids derived from them.
+    # They are derived from the OpenAlex id so a resumed run rebuilds identical ids
+    df = data_preparer.create_article_df(df, stable_ids=True)
 
     # Verify that all UUIDs are unique
     assert df['uuid'].is_unique, "There are duplicate UUIDs!"
-    
-    
+
+
     # Data for Date
     date_df = data_preparer.create_date_df(df)
     # Data for Journal
@@ -30,68 +83,534 @@ def main():
     # Data for Author
     author_df = data_preparer.create_author_df(df)
     # Data for Institution
-    author_institution_data = pd.read_json('institution data ')
+    author_institution_data = pd.read_json(INPUT_FILES['institutions'])
     institution_df = data_preparer.create_institution_df(author_institution_data)
     # Data for Country
-    country_df = data_preparer.create_country_df(author_institution_data)    
+    country_df = data_preparer.create_country_df(author_institution_data)
     # Data for Funder
-    funder_data = pd.read_json('funder data', orient='index').reset_index()
+    funder_data = pd.read_json(INPUT_FILES['funders'], orient='index').reset_index()
     funder_df = data_preparer.create_funder_df(funder_data)
-    
+
+    # Data for Article - Author relationship
+    article_author_df = data_preparer.create_article_author_df(df)
     # Data for Author - Instituion relationship
     author_institution_df = data_preparer.create_author_institution_df(author_institution_data)
     # Data for Article - Funder relationship
     article_funder_df = data_preparer.create_article_funder_df(data)
     # Data for Funder - Country relationship
-    article_funder_df = data_preparer.create_funder_country_df(funder_df)
-
-    #-------Create Cypher Queries for Nodes-------#
-    ''' Note different dataframes for some nodes'''
-    article_nodes, article_properties = node_creator.create_article_nodes(df)
-    year_nodes, year_properties = node_creator.create_date_nodes(date_df)
-    title_nodes, title_properties = node_creator.create_title_nodes(df)
-    abstract_nodes, abstract_properties = node_creator.create_abstract_nodes(df)
-    topic_nodes, topic_properties = node_creator.create_topic_nodes(df)
-    journal_nodes, journal_properties = node_creator.create_journal_nodes(journal_df)
-    author_nodes, author_properties = node_creator.create_author_nodes(author_df)
-    institution_nodes, institution_properties = node_creator.create_institution_nodes(institution_df)
-    country_nodes, country_properties = node_creator.create_country_nodes(country_df)
-    funder_nodes, funder_properties = node_creator.create_funder_nodes(funder_df)
-    
-    #-------Submit Cypher Queries to Neo4j Graph-------#
-    node_creator.create_nodes(article_nodes, article_properties)
-    node_creator.create_nodes(year_nodes, year_properties)
-    node_creator.create_nodes(title_nodes, title_properties)
-    node_creator.create_nodes(abstract_nodes, abstract_properties)
-    node_creator.create_nodes(topic_nodes, topic_properties)
-    node_creator.create_nodes(journal_nodes, journal_properties)
-    node_creator.create_nodes(author_nodes, author_properties)
-    node_creator.create_nodes(institution_nodes, institution_properties)
-    node_creator.create_nodes(country_nodes, country_properties)
-    node_creator.create_nodes(funder_nodes, funder_properties)
-    
-    #-------Create Cypher Queries for Relationships-------#
-    ''' Note different dataframes for some relationships'''
-    # Variable article_year => article to year
-    article_year = relationship_creator.create_relationship_article_year(df)
-    article_title = relationship_creator.create_relationship_article_title(df)
-    article_abstract = relationship_creator.create_relationship_article_abstract(df)
-    article_topic = relationship_creator.create_relationship_article_topic(df)
-    article_journal = relationship_creator.create_relationship_article_journal(df)
-    article_author = relationship_creator.create_relationship_article_author(df)
-    author_institution = relationship_creator.create_relationship_author_institution(author_institution_df)
-    institution_country = relationship_creator.create_relationship_institution_country(institution_df)
-    article_funder = relationship_creator.create_relationship_article_funder(article_funder_df)
-    funder_country = relationship_creator.create_relationship_funder_country(article_funder_df)
-    
-    #-------Submit Cypher Queries to Neo4j Graph-------#
-    relationship_creator.create_relationships(article_year)
-    relationship_creator.create_relationships(article_title)
-    relationship_creator.create_relationships(article_abstract)
-    relationship_creator.create_relationships(article_topic)
-    relationship_creator.create_relationships(article_journal)
-    relationship_creator.create_relationships(article_author)
-    relationship_creator.create_relationships(author_institution)
-    relationship_creator.create_relationships(institution_country)
-    relationship_creator.create_relationships(article_funder)
-    relationship_creator.create_relationships(funder_country)
+    funder_country_df = data_preparer.create_funder_country_df(funder_df)
+    # Data for Article - Article citations, restricted to the articles of the corpus
+    citation_df = data_preparer.create_citation_df(df, corpus_ids=set(df['id'].astype(str)))
+
+    return {
+        'article': df,
+        'date': date_df,
+        'journal': journal_df,
+        'author': author_df,
+        'institution': institution_df,
+        'country': country_df,
+        'funder': funder_df,
+        'article_author': article_author_df,
+        'author_institution': author_institution_df,
+        'article_funder': article_funder_df,
+        'funder_country': funder_country_df,
+        'citation': citation_df,
+    }
+
+
+def load_frames(data_preparer, cache=None, names=None, refresh=False):
+    '''
+    Prepared frames, read from the Parquet FrameCache when the raw inputs and
+    the preprocess version are unchanged, otherwise prepared and cached.
+    With names only those frames are returned (and read from the cache)
+    '''
+    key = None
+    if cache:
+        key = cache.key(
+            list(INPUT_FILES.values()),
+            data_preparer.VERSION,
+            compact=data_preparer.compact
+        )
+        frames = None if refresh else cache.load(key, names=names)
+        if frames is not None:
+            return frames
+
+    frames = prepare_frames(data_preparer)
+    if cache:
+        cache.store(key, frames)
+    if names:
+        frames = {name: frames[name] for name in names}
+    return frames
+
+
+def selected_frames(labels=None, relationships=None):
+    """Frames needed to write the given labels and relationship specs (None: all)"""
+    labels = NODE_FRAMES if labels is None else labels
+    relationships = RELATIONSHIP_FRAMES if relationships is None else relationships
+    return sorted(
+        {NODE_FRAMES[label] for label in labels}
+        | {RELATIONSHIP_FRAMES[name] for name in relationships}
+    )
+
+
+def build_relationship_pairs(relationship_creator, frames, relationships=None):
+    """(start_id, end_id) pairs for every relationship spec (or only the given ones)"""
+    return {
+        name: getattr(relationship_creator, f"create_pairs_{name}")(frames[frame_name])
+        for name, frame_name in RELATIONSHIP_FRAMES.items()
+        if relationships is None or name in relationships
+    }
+
+
+def node_stage(label):
+    return f"nodes:{label}"
+
+
+def relationship_stage(name):
+    return f"relationships:{name}"
+
+
+def load_graph(
+    frames,
+    workers=1,
+    batch_size=None,
+    checkpoint=None,
+    driver=None,
+    labels=None,
+    relationships=None,
+    concurrency=1,
+    id_map=None
+):
+    '''
+    Write the prepared frames to Neo4j through batched Cypher transactions.
+    The load is a DAG of stages: schema bootstrap, one stage per node label
+    and one per relationship spec, which waits for the loads of its two
+    endpoint labels. Up to concurrency stages run at the same time.
+    With workers > 1 the batches of a stage are fanned out over a pool of sessions.
+    With a CheckpointManifest every committed batch is recorded and batches
+    committed by an earlier run are skipped (sequential writes only).
+    labels / relationships restrict the load to those node labels and
+    relationship specs (None: all of them).
+    With a NodeIdMap the elementIds of the written nodes are collected and
+    relationships address their endpoints by elementId (sequential writes only)
+    '''
+    if checkpoint and workers > 1:
+        raise ValueError("Checkpointed imports write sequentially, use workers=1")
+    if id_map is not None and (checkpoint or workers > 1):
+        raise ValueError("elementId resolution needs a sequential, non-checkpointed load")
+
+    node_creator = GraphNodeCreator(driver=driver)
+    relationship_creator = GraphRelationshipCreator(driver=driver)
+    schema_manager = SchemaManager(driver=driver)
+    parallel_writer = None
+    if workers > 1:
+        parallel_writer = ParallelGraphWriter(
+            node_creator.driver,
+            workers=workers,
+            batch_size=batch_size
+        )
+
+    def write_nodes(label):
+        ''' Node properties are written in UNWIND batches, one transaction per batch '''
+        _queries, properties = node_creator.create_node_rows(NODE_SPECS[label], frames[NODE_FRAMES[label]])
+        if parallel_writer:
+            parallel_writer.write_nodes(label, properties)
+        else:
+            node_creator.create_nodes_batched(
+                label,
+                properties,
+                batch_size=batch_size,
+                checkpoint=checkpoint,
+                id_map=id_map
+            )
+
+    def write_relationships(name):
+        ''' Note different dataframes for some relationships'''
+        frame = frames[RELATIONSHIP_FRAMES[name]]
+        if name == 'article_article' and not parallel_writer:
+            # CITES rows are built batch by batch from the edge table
+            relationship_creator.create_citation_relationships(
+                frame,
+                batch_size=batch_size,
+                checkpoint=checkpoint,
+                id_map=id_map
+            )
+            return
+
+        pairs = getattr(relationship_creator, f"create_pairs_{name}")(frame)
+        if parallel_writer:
+            parallel_writer.write_relationships(name, pairs)
+        else:
+            relationship_creator.create_relationships_batched(
+                name,
+                pairs,
+                batch_size=batch_size,
+                checkpoint=checkpoint,
+                id_map=id_map
+            )
+
+    scheduler = StageScheduler(max_concurrency=concurrency)
+    #-------Bootstrap constraints and indexes before any write-------#
+    scheduler.add('schema', schema_manager.bootstrap)
+
+    #-------Submit Node batches to Neo4j Graph-------#
+    for label in NODE_FRAMES:
+        if labels is None or label in labels:
+            scheduler.add(node_stage(label), partial(write_nodes, label), depends_on=['schema'])
+
+    #-------Submit Relationship batches to Neo4j Graph-------#
+    for name in RELATIONSHIP_FRAMES:
+        if relationships is not None and name not in relationships:
+            continue
+        spec = RELATIONSHIP_SPECS[name]
+        # Endpoint labels outside of this load are expected to exist already
+        endpoints = {
+            node_stage(label) for label in (spec.start_label, spec.end_label)
+            if node_stage(label) in scheduler.stages
+        }
+        scheduler.add(
+            relationship_stage(name),
+            partial(write_relationships, name),
+            depends_on=['schema', *sorted(endpoints)]
+        )
+
+    scheduler.run()
+    scheduler.print_timeline()
+    if id_map is not None:
+        print(f"Node elementIds collected: {id_map.counts()}")
+    if parallel_writer:
+        parallel_writer.print_summary()
+    if driver is None:
+        ConnectionRegistry.print_pool_metrics()
+
+
+async def write_graph_async(writer, frames, labels=None, relationships=None):
+    '''
+    Feed the node jobs, then the relationship jobs, through an AsyncGraphWriter.
+    Jobs are generated lazily, so the parameters of a label or relationship type
+    are only built once the writer reaches it
+    '''
+    # Only used to build queries and pairs, their sync driver is never opened
+    node_creator = GraphNodeCreator()
+    relationship_creator = GraphRelationshipCreator()
+
+    def node_jobs():
+        for label, frame_name in NODE_FRAMES.items():
+            if labels is not None and label not in labels:
+                continue
+            yield (
+                label,
+                node_creator.create_batch_node_query(label),
+                FrameRows(
+                    unique_by(frames[frame_name], NODE_SPECS[label].columns, NODE_SPECS[label].id_key),
+                    NODE_SPECS[label].columns
+                )
+            )
+
+    def relationship_jobs():
+        for name, frame_name in RELATIONSHIP_FRAMES.items():
+            if relationships is not None and name not in relationships:
+                continue
+            spec = RELATIONSHIP_SPECS[name]
+            if name == 'article_article':
+                rows = FrameRows(frames[frame_name], {'start_id': 'article_id', 'end_id': 'cited_id'})
+            else:
+                pairs = getattr(relationship_creator, f"create_pairs_{name}")(frames[frame_name])
+                rows = [{'start_id': start_id, 'end_id': end_id} for start_id, end_id in pairs]
+            yield spec.name, relationship_creator.create_batch_relationship_query(spec), rows
+
+    # Relationship batches MATCH their endpoints, so every node is committed first
+    await writer.write(node_jobs())
+    await writer.write(relationship_jobs())
+
+
+def load_graph_async(
+    frames,
+    concurrency=None,
+    batch_size=None,
+    labels=None,
+    relationships=None,
+    driver=None,
+    async_driver=None
+):
+    '''
+    Write the prepared frames through the asyncio writer: one event loop with
+    up to concurrency transactions in flight
+    '''
+    SchemaManager(driver=driver).bootstrap()
+    writer = AsyncGraphWriter(driver=async_driver, concurrency=concurrency, batch_size=batch_size)
+
+    async def run():
+        try:
+            await write_graph_async(writer, frames, labels=labels, relationships=relationships)
+        finally:
+            await writer.close()
+
+    asyncio.run(run())
+    writer.print_summary()
+
+
+def profile_graph(
+    frames,
+    sample_size=100,
+    explain=False,
+    driver=None,
+    labels=None,
+    relationships=None,
+    merge=False
+):
+    '''
+    Diagnostics: PROFILE (or EXPLAIN) every node and relationship statement
+    shape with a sample batch, without writing anything, and print the plans
+    '''
+    node_creator = GraphNodeCreator(driver=driver)
+    relationship_creator = GraphRelationshipCreator(driver=driver)
+    profiler = StatementProfiler(driver=node_creator.driver, explain=explain)
+
+    for label, frame_name in NODE_FRAMES.items():
+        if labels is not None and label not in labels:
+            continue
+        sample = frames[frame_name].head(sample_size)
+        _queries, properties = node_creator.create_node_rows(NODE_SPECS[label], sample)
+        node_creator.profile_nodes_batched(
+            label, properties, profiler, sample_size=sample_size, merge=merge
+        )
+
+    for name, frame_name in RELATIONSHIP_FRAMES.items():
+        if relationships is not None and name not in relationships:
+            continue
+        pairs = getattr(relationship_creator, f"create_pairs_{name}")(frames[frame_name].head(sample_size))
+        relationship_creator.profile_relationships_batched(
+            name, pairs, profiler, sample_size=sample_size
+        )
+
+    profiler.print_report()
+    return profiler.reports
+
+
+def export_graph(frames, output_dir, compress=False):
+    """Write the prepared frames as neo4j-admin import files instead of transactions"""
+    exporter = BulkImportExporter(output_dir, compress=compress)
+    relationship_creator = GraphRelationshipCreator()
+
+    for label, frame_name in NODE_FRAMES.items():
+        exporter.export_nodes(label, frames[frame_name])
+
+    relationship_pairs = build_relationship_pairs(relationship_creator, frames)
+    for name, pairs in relationship_pairs.items():
+        exporter.export_relationships(name, pairs)
+
+    print("Load the files into a fresh, stopped database with:")
+    print(exporter.import_command())
+    return exporter
+
+
+def stream_graph(
+    article_path,
+    institution_path=None,
+    funder_path=None,
+    chunk_size=None,
+    incremental=False,
+    fingerprint_path=None
+):
+    '''
+    Write JSON Lines inputs chunk by chunk, never holding the whole corpus in memory.
+    With incremental only new or changed articles are upserted
+    '''
+    SchemaManager().bootstrap()
+    if incremental:
+        importer = IncrementalImporter(
+            fingerprint_store=FingerprintStore(fingerprint_path) if fingerprint_path else None,
+            chunk_size=chunk_size
+        )
+    else:
+        importer = StreamingImporter(chunk_size=chunk_size)
+    importer.run(
+        article_path,
+        institution_path=institution_path,
+        funder_path=funder_path
+    )
+
+
+def main(
+    mode='load',
+    output_dir='data_outputs/neo4j_import',
+    compress=False,
+    workers=1,
+    batch_size=None,
+    checkpoint_path=None,
+    resume=False,
+    compact=False,
+    cache_dir=None,
+    refresh_cache=False,
+    labels=None,
+    relationships=None,
+    concurrency=1,
+    async_writes=False,
+    resolve_ids=False,
+    node_id_store=None
+):
+    # Instantiate some classes
+    data_preparer = DataPreprocess(compact=compact)
+    cache = FrameCache(cache_dir) if cache_dir else None
+
+    names = None
+    if labels is not None or relationships is not None:
+        # Only the given labels / relationship specs, and only the frames they need
+        labels = labels or []
+        relationships = relationships or []
+        names = selected_frames(labels, relationships)
+
+    if mode == 'export':
+        frames = load_frames(data_preparer, cache=cache, refresh=refresh_cache)
+        export_graph(frames, output_dir, compress=compress)
+    elif mode in ('profile', 'explain'):
+        frames = load_frames(data_preparer, cache=cache, names=names, refresh=refresh_cache)
+        profile_graph(
+            frames,
+            explain=mode == 'explain',
+            labels=labels,
+            relationships=relationships
+        )
+    else:
+        frames = load_frames(data_preparer, cache=cache, names=names, refresh=refresh_cache)
+        if async_writes:
+            if checkpoint_path or resume:
+                raise ValueError("Checkpointed imports write sequentially, drop --async-writes")
+            load_graph_async(
+                frames,
+                concurrency=workers if workers > 1 else None,
+                batch_size=batch_size,
+                labels=labels,
+                relationships=relationships
+            )
+            return
+        checkpoint = None
+        if checkpoint_path or resume:
+            checkpoint = CheckpointManifest(
+                checkpoint_path or 'data_outputs/import_checkpoint.json',
+                resume=resume
+            )
+        id_map = None
+        if node_id_store:
+            id_map = SqliteNodeIdMap(node_id_store)
+        elif resolve_ids:
+            id_map = NodeIdMap()
+        load_graph(
+            frames,
+            workers=workers,
+            batch_size=batch_size,
+            checkpoint=checkpoint,
+            labels=labels,
+            relationships=relationships,
+            concurrency=concurrency,
+            id_map=id_map
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import OpenAlex data into Neo4j")
+    parser.add_argument(
+        '--mode',
+        choices=['load', 'export', 'stream', 'profile', 'explain'],
+        default='load',
+        help=(
+            "load: batched Cypher transactions, export: neo4j-admin import CSV files, "
+            "stream: chunked load of JSON Lines inputs, "
+            "profile/explain: plans of every write statement on a sample batch, nothing is written"
+        )
+    )
+    parser.add_argument('--output-dir', default='data_outputs/neo4j_import')
+    parser.add_argument('--gzip', action='store_true', help="gzip the exported data files")
+    parser.add_argument('--articles', help="articles JSON Lines file for --mode stream")
+    parser.add_argument('--institutions', help="author/institution JSON Lines file for --mode stream")
+    parser.add_argument('--funders', help="funder JSON file for --mode stream")
+    parser.add_argument('--chunk-size', type=int, help="rows per chunk for --mode stream")
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help="--mode stream: stable ids, MERGE upserts, skip articles whose fingerprint is unchanged"
+    )
+    parser.add_argument('--fingerprints', help="SQLite fingerprint store for --incremental")
+    parser.add_argument('--workers', type=int, default=1, help="concurrent writer sessions for --mode load")
+    parser.add_argument('--batch-size', type=int, help="rows per UNWIND transaction")
+    parser.add_argument(
+        '--async-writes',
+        action='store_true',
+        help="--mode load: write through the asyncio driver, --workers transactions in flight"
+    )
+    parser.add_argument(
+        '--resolve-ids',
+        action='store_true',
+        help="--mode load: collect node elementIds and write relationships by elementId"
+    )
+    parser.add_argument(
+        '--node-id-store',
+        help="like --resolve-ids, with the elementId map in this SQLite file instead of memory"
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help="--mode load: label / relationship stages running at the same time"
+    )
+    parser.add_argument('--checkpoint', help="checkpoint manifest recording committed batches of --mode load")
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="--mode load: skip the batches recorded in the checkpoint manifest"
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help="categorical / nullable int / float32 / Arrow string columns in the prepared frames"
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help="Parquet cache of the prepared frames, reused while the raw inputs are unchanged"
+    )
+    parser.add_argument('--refresh-cache', action='store_true', help="re-prepare and overwrite the cached frames")
+    parser.add_argument(
+        '--labels',
+        nargs='+',
+        choices=list(NODE_FRAMES),
+        help="--mode load: only write these node labels"
+    )
+    parser.add_argument(
+        '--relationships',
+        nargs='+',
+        choices=list(RELATIONSHIP_FRAMES),
+        help="--mode load: only write these relationship specs"
+    )
+    args = parser.parse_args()
+
+    if args.mode == 'stream':
+        if not args.articles:
+            parser.error("--mode stream requires --articles")
+        stream_graph(
+            args.articles,
+            institution_path=args.institutions,
+            funder_path=args.funders,
+            chunk_size=args.chunk_size,
+            incremental=args.incremental,
+            fingerprint_path=args.fingerprints
+        )
+    else:
+        main(
+            mode=args.mode,
+            output_dir=args.output_dir,
+            compress=args.gzip,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            checkpoint_path=args.checkpoint,
+            resume=args.resume,
+            compact=args.compact,
+            cache_dir=args.cache_dir,
+            refresh_cache=args.refresh_cache,
+            labels=args.labels,
+            relationships=args.relationships,
+            concurrency=args.concurrency,
+            async_writes=args.async_writes,
+            resolve_ids=args.resolve_ids,
+            node_id_store=args.node_id_store
+        )
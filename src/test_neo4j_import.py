@@ -1,9 +1,9 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from langchain_neo4j import Neo4jGraph
+from src.database_configs.connection_registry import ConnectionRegistry
 
-graph = Neo4jGraph()
+graph = ConnectionRegistry.get_graph()
 
 # Import movie information
 
@@ -0,0 +1,29 @@
+import contextlib
+import io
+import pytest
+from src.services.neo4j_graph_builder.data_preprocess import DataPreprocess
+from src.services.neo4j_graph_builder.ingestion_benchmark import generate_openalex_frames
+
+
+@pytest.fixture(scope='session')
+def frames():
+    """Prepared frames of a small synthetic OpenAlex corpus, keyed like submit_queries.prepare_frames"""
+    raw = generate_openalex_frames(200)
+    preparer = DataPreprocess()
+    with contextlib.redirect_stdout(io.StringIO()):
+        article = preparer.create_article_df(raw['articles'], stable_ids=True)
+        funder = preparer.create_funder_df(raw['funders'])
+        return {
+            'article': article,
+            'date': preparer.create_date_df(article),
+            'journal': preparer.create_journal_df(article),
+            'author': preparer.create_author_df(article),
+            'institution': preparer.create_institution_df(raw['institutions']),
+            'country': preparer.create_country_df(raw['institutions']),
+            'funder': funder,
+            'author_institution': preparer.create_author_institution_df(raw['institutions']),
+            'article_author': preparer.create_article_author_df(article),
+            'article_funder': preparer.create_article_funder_df(article),
+            'funder_country': preparer.create_funder_country_df(funder),
+            'citation': preparer.create_citation_df(article, corpus_ids=set(article['id'])),
+        }
@@ -0,0 +1,66 @@
+import contextlib
+import io
+from collections import Counter
+import pytest
+from neo4j.exceptions import IncompleteCommit, ServiceUnavailable
+from src.services.neo4j_graph_builder.checkpoint import CheckpointManifest
+from src.services.neo4j_graph_builder.fake_driver import FakeDriver
+from src.services.neo4j_graph_builder.submit_queries import load_graph
+
+BATCH_SIZE = 50
+
+
+def written_batches(driver):
+    """(statement, rows) of every committed UNWIND batch"""
+    return Counter(
+        (query, rows) for query, rows in driver.statements if query.startswith('UNWIND')
+    )
+
+
+def load(frames, driver, checkpoint):
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_graph(frames, batch_size=BATCH_SIZE, checkpoint=checkpoint, driver=driver)
+
+
+@pytest.mark.parametrize('fail_at_batch', [3, 40])
+def test_resume_after_failure_writes_every_batch_once(tmp_path, frames, fail_at_batch):
+    manifest_path = str(tmp_path / 'checkpoint.json')
+
+    clean = FakeDriver()
+    load(frames, clean, CheckpointManifest(str(tmp_path / 'clean.json')))
+
+    failing = FakeDriver(fail_at_batch=fail_at_batch)
+    with pytest.raises(ServiceUnavailable):
+        load(frames, failing, CheckpointManifest(manifest_path))
+    assert failing.rows_written('UNWIND') < clean.rows_written('UNWIND')
+
+    resumed = FakeDriver()
+    load(frames, resumed, CheckpointManifest(manifest_path, resume=True))
+
+    assert failing.rows_written('UNWIND') + resumed.rows_written('UNWIND') == clean.rows_written('UNWIND')
+    assert written_batches(failing) + written_batches(resumed) == written_batches(clean)
+
+
+def test_batch_committed_before_its_checkpoint_is_merged_again(tmp_path, frames):
+    manifest_path = str(tmp_path / 'checkpoint.json')
+
+    clean = FakeDriver()
+    load(frames, clean, CheckpointManifest(str(tmp_path / 'clean.json')))
+
+    # The third batch commits, but the failure hits before it is checkpointed
+    failing = FakeDriver(fail_after_batch=3)
+    with pytest.raises(IncompleteCommit):
+        load(frames, failing, CheckpointManifest(manifest_path))
+    committed_unrecorded = [
+        (query, rows) for query, rows in failing.statements if query.startswith('UNWIND')
+    ][-1]
+
+    resumed = FakeDriver()
+    load(frames, resumed, CheckpointManifest(manifest_path, resume=True))
+
+    # Exactly that batch is written twice, as a MERGE so it does not duplicate its nodes
+    assert written_batches(failing) + written_batches(resumed) == (
+        written_batches(clean) + Counter([committed_unrecorded])
+    )
+    assert ' MERGE (n:' in committed_unrecorded[0]
+    assert not any(' CREATE (n:' in query for query, _rows in resumed.statements)
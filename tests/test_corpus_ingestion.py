@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+
+# corpus_ingestion imports KnowledgeGraphBuilder and its LLM / rendering dependencies
+for module in ['langchain_community', 'langchain_experimental', 'langchain_ollama',
+               'langchain_openai', 'pyvis', 'tiktoken']:
+    pytest.importorskip(module)
+
+from langchain_community.graphs.graph_document import GraphDocument  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from src.services.knowledge_graph_tools.corpus_ingestion import CorpusIngestion  # noqa: E402
+
+
+class StubBuilder:
+    """KnowledgeGraphBuilder stand-in: one chunk per document, empty extractions"""
+
+    concurrency = 2
+
+    def __init__(self, store_error=None):
+        self.store_error = store_error
+        self.stored = 0
+
+    def split_text(self, text):
+        return [Document(page_content=text)]
+
+    def count_tokens(self, text):
+        return len(text.split())
+
+    async def extract_chunks(self, documents, semaphore=None):
+        await asyncio.sleep(0)
+        return [GraphDocument(nodes=[], relationships=[], source=document) for document in documents]
+
+    def store_graph_to_db(self, graph_documents, resolve_entities=True):
+        if self.store_error:
+            raise self.store_error
+        self.stored += len(graph_documents)
+        return {'nodes': 0, 'edges': 0}
+
+
+def documents(count):
+    return ((f"d{i}", "some text", {}) for i in range(count))
+
+
+def ingest(builder, count):
+    ingestion = CorpusIngestion(
+        builder, document_workers=2, queue_size=2, write_batch=3, report_every=60
+    )
+    return asyncio.run(asyncio.wait_for(ingestion.run(documents(count)), timeout=10))
+
+
+def test_every_document_is_written():
+    builder = StubBuilder()
+    stats = ingest(builder, 20)
+    assert builder.stored == 20
+    assert stats['documents_written'] == 20
+
+
+def test_writer_failure_is_raised_instead_of_hanging():
+    with pytest.raises(RuntimeError, match="neo4j down"):
+        ingest(StubBuilder(store_error=RuntimeError("neo4j down")), 1000)
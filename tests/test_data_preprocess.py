@@ -0,0 +1,67 @@
+import pandas as pd
+from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator, GraphRelationshipCreator
+from src.services.neo4j_graph_builder.data_preprocess import DataPreprocess
+from src.services.neo4j_graph_builder.fake_driver import FakeDriver
+from src.services.neo4j_graph_builder.graph_specs import NODE_SPECS
+
+
+def citation_pairs(article_ids, references):
+    data = pd.DataFrame({'id': article_ids, 'referenced_works': references})
+    df = DataPreprocess().create_citation_df(data, corpus_ids=set(article_ids))
+    return sorted(zip(df['article_id'], df['cited_id']))
+
+
+def test_citations_inside_a_corpus_of_bare_ids():
+    pairs = citation_pairs(
+        ['W1', 'W2', 'W3'],
+        [
+            ['https://openalex.org/W2', 'https://openalex.org/W9'],
+            ['https://openalex.org/W2', 'https://openalex.org/W3'],
+            [],
+        ]
+    )
+    assert pairs == [('W1', 'W2'), ('W2', 'W3')]
+
+
+def test_citations_inside_a_corpus_of_openalex_urls():
+    article_ids = ['https://openalex.org/W1', 'https://openalex.org/W2']
+    pairs = citation_pairs(
+        article_ids,
+        [['https://openalex.org/W2', 'https://openalex.org/W9'], ['https://openalex.org/W1']]
+    )
+    assert pairs == [(article_ids[0], article_ids[1]), (article_ids[1], article_ids[0])]
+
+
+def test_journal_ids_match_the_article_journal_pairs():
+    data = pd.DataFrame({
+        'id': ['W1', 'W2'],
+        'journal': ['Journal S1', 'Journal Sx'],
+        'issn': ['0000-0001', '0000-0002'],
+        'sjr_score': [1.0, 2.0],
+        'h_index': [10, 20],
+        'sjr_best_quartile': ['Q1', 'Q2'],
+        # lstrip('https://openalex.org') would also eat the leading 's' of 'sources'
+        'primary_location': [
+            {'source': {'id': 'https://openalex.org/S1'}},
+            {'source': {'id': 'https://openalex.org/sources/S2'}},
+        ],
+    })
+    journal_df = DataPreprocess().create_journal_df(data)
+    pairs = GraphRelationshipCreator(driver=FakeDriver()).create_pairs_article_journal(data)
+    assert journal_df['journal_id'].tolist() == ['S1', 'sources/S2']
+    assert [journal_id for _article_id, journal_id in pairs] == journal_df['journal_id'].tolist()
+
+
+def test_one_country_node_per_code():
+    institutions = pd.DataFrame({
+        'institution_country_code': ['US', 'US', 'DE', 'NL', 'NL'],
+        'country': ['United States', 'United States of America', 'Germany', 'The Netherlands', 'Netherlands'],
+    })
+    country_df = DataPreprocess().create_country_df(institutions)
+    assert sorted(zip(country_df['institution_country_code'], country_df['country'])) == [
+        ('DE', 'Germany'), ('NL', 'Netherlands'), ('US', 'United States'),
+    ]
+
+    # Node rows are unique on the spec id even when the frame repeats it
+    _queries, rows = GraphNodeCreator().create_node_rows(NODE_SPECS['Country'], institutions)
+    assert sorted(row['country_id'] for row in rows) == ['DE', 'NL', 'US']
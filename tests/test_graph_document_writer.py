@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+import pytest
+from src.services.knowledge_graph_tools.graph_document_writer import GraphDocumentWriter, quote_name
+from src.services.neo4j_graph_builder.fake_driver import FakeDriver
+
+
+def node(node_id, node_type):
+    return SimpleNamespace(id=node_id, type=node_type, properties={})
+
+
+def relationship(source, relationship_type, target):
+    return SimpleNamespace(source=source, target=target, type=relationship_type, properties={})
+
+
+def test_quote_name_rejects_empty_types():
+    assert quote_name('Per`son ') == '`Person`'
+    for name in ['', '  ', '``', None]:
+        with pytest.raises(ValueError):
+            quote_name(name)
+
+
+def test_untyped_nodes_and_relationships_are_rejected():
+    einstein, ulm, blank = node('Einstein', 'Person'), node('Ulm', 'City'), node('Thing', '`` ')
+    document = SimpleNamespace(
+        nodes=[einstein, ulm, blank],
+        relationships=[
+            relationship(einstein, 'BORN_IN', ulm),
+            relationship(einstein, '', ulm),
+            relationship(blank, 'NEAR', ulm),
+        ],
+    )
+    driver = FakeDriver()
+    summary = GraphDocumentWriter(driver=driver, ensure_indexes=False).write([document])
+
+    assert summary['nodes'] == 2 and summary['edges'] == 1
+    assert summary['rejected_nodes'] == 1 and summary['rejected_relationships'] == 2
+    assert summary['failed_batches'] == 0
+    assert not any('``' in query for query, _rows in driver.statements)
+
+
+def test_failed_batch_is_recorded_and_the_rest_written():
+    people = [node(f"Person {n}", 'Person') for n in range(5)]
+    document = SimpleNamespace(nodes=people, relationships=[])
+    writer = GraphDocumentWriter(driver=FakeDriver(fail_at_batch=2), batch_size=2, ensure_indexes=False)
+    summary = writer.write([document])
+
+    assert summary['nodes'] == 3 and summary['failed_batches'] == 1
+    assert writer.failures[0]['rows'] == 2
@@ -0,0 +1,87 @@
+import pytest
+from neo4j.exceptions import ServiceUnavailable
+from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator, GraphRelationshipCreator
+from src.services.neo4j_graph_builder.data_preprocess import DataPreprocess
+from src.services.neo4j_graph_builder.fake_driver import FakeDriver
+from src.services.neo4j_graph_builder.fingerprint_store import FingerprintStore
+from src.services.neo4j_graph_builder.incremental_import import IncrementalImporter
+from src.services.neo4j_graph_builder.ingestion_benchmark import generate_openalex_frames
+
+
+class CitationFailingDriver(FakeDriver):
+    """FakeDriver whose CITES statements fail, as if the run stopped in the citation pass"""
+
+    def record(self, query, parameters):
+        if ':CITES]' in query:
+            raise ServiceUnavailable("Simulated failure in the citation pass")
+        return super().record(query, parameters)
+
+
+def cites_rows(driver):
+    return sum(rows for query, rows in driver.statements if ':CITES]' in query)
+
+
+def make_importer(driver, store):
+    return IncrementalImporter(
+        fingerprint_store=store,
+        chunk_size=20,
+        node_creator=GraphNodeCreator(driver=driver),
+        relationship_creator=GraphRelationshipCreator(driver=driver)
+    )
+
+
+@pytest.fixture
+def articles(tmp_path):
+    frame = generate_openalex_frames(50)['articles']
+    path = tmp_path / 'articles.jsonl'
+    frame.to_json(path, orient='records', lines=True)
+    return frame, str(path)
+
+
+def test_failed_citation_pass_is_rewritten_by_the_next_run(tmp_path, articles):
+    frame, path = articles
+    store = FingerprintStore(str(tmp_path / 'fingerprints.sqlite'))
+    article_ids = frame['id'].tolist()
+    expected_citations = len(
+        DataPreprocess().create_citation_df(frame, corpus_ids=set(article_ids))
+    )
+    assert expected_citations > 0
+
+    with pytest.raises(ServiceUnavailable):
+        make_importer(CitationFailingDriver(), store).run(path)
+    # Nothing is marked as imported while its citations are missing
+    assert store.lookup(article_ids) == {}
+
+    driver = FakeDriver()
+    importer = make_importer(driver, store)
+    importer.run(path)
+    assert importer.counts['new'] == len(frame)
+    assert cites_rows(driver) == expected_citations
+    assert len(store.lookup(article_ids)) == len(frame)
+
+    driver = FakeDriver()
+    importer = make_importer(driver, store)
+    importer.run(path)
+    assert importer.counts['unchanged'] == len(frame)
+    assert cites_rows(driver) == 0
+
+
+def test_unchanged_article_citing_a_later_work_gets_its_edge(tmp_path):
+    frame = generate_openalex_frames(3)['articles']
+    frame['referenced_works'] = [['https://openalex.org/W2'], [], []]
+    store = FingerprintStore(str(tmp_path / 'fingerprints.sqlite'))
+
+    week_one = tmp_path / 'week_one.jsonl'
+    frame[frame['id'] != 'W2'].to_json(week_one, orient='records', lines=True)
+    driver = FakeDriver()
+    make_importer(driver, store).run(str(week_one))
+    # W2 is not in the corpus yet, W0's reference to it is dropped
+    assert cites_rows(driver) == 0
+
+    week_two = tmp_path / 'week_two.jsonl'
+    frame.to_json(week_two, orient='records', lines=True)
+    driver = FakeDriver()
+    importer = make_importer(driver, store)
+    importer.run(str(week_two))
+    assert importer.counts == {'new': 1, 'changed': 0, 'unchanged': 2}
+    assert cites_rows(driver) == 1
@@ -0,0 +1,61 @@
+import contextlib
+import io
+from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator, GraphRelationshipCreator
+from src.services.neo4j_graph_builder.fake_driver import FakeDriver, FakeResult
+from src.services.neo4j_graph_builder.graph_specs import RELATIONSHIP_SPECS
+from src.services.neo4j_graph_builder.node_id_map import NodeIdMap, SqliteNodeIdMap
+
+
+def test_node_batches_collect_element_ids_on_the_fake_driver():
+    driver = FakeDriver()
+    id_map = NodeIdMap()
+    properties = [{'year_id': year, 'year': year} for year in range(2000, 2010)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        GraphNodeCreator(driver=driver).create_nodes_batched(
+            'Year', properties, batch_size=4, id_map=id_map
+        )
+    assert driver.rows_written('UNWIND') == len(properties)
+    assert id_map.counts() == {'Year': len(properties)}
+    assert None not in id_map.resolve('Year', range(2000, 2010))
+
+
+class StaleElementIdDriver(FakeDriver):
+    """FakeDriver on which no seeked elementId matches its node any more"""
+
+    def record(self, query, parameters):
+        result = super().record(query, parameters)
+        if 'elementId(a) = row.start_element_id' in query:
+            return FakeResult([
+                {'start_id': row['start_id'], 'end_id': row['end_id']} for row in parameters['rows']
+            ])
+        return result
+
+
+def test_stale_element_ids_fall_back_to_property_lookup():
+    driver = StaleElementIdDriver()
+    id_map = NodeIdMap()
+    id_map.add('Article', [('W1', '4:old:1'), ('W2', '4:old:2')])
+    id_map.add('Year', [(2001, '4:old:3')])
+    pairs = [('W1', 2001), ('W2', 2001), ('W3', 2001)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        GraphRelationshipCreator(driver=driver).create_relationships_batched(
+            'article_year', pairs, id_map=id_map
+        )
+    property_lookup = GraphRelationshipCreator(driver=driver).create_batch_relationship_query(
+        RELATIONSHIP_SPECS['article_year']
+    )
+    assert driver.rows_written(property_lookup) == len(pairs)
+
+
+def test_rewritten_label_drops_earlier_element_ids(tmp_path):
+    id_map = SqliteNodeIdMap(str(tmp_path / 'node_ids.sqlite'))
+    id_map.add('Year', [(1999, '4:old:1'), (2000, '4:old:2')])
+    id_map.add('Article', [('W1', '4:old:3')])
+    with contextlib.redirect_stdout(io.StringIO()):
+        GraphNodeCreator(driver=FakeDriver()).create_nodes_batched(
+            'Year', [{'year_id': 2000, 'year': 2000}], id_map=id_map
+        )
+    assert id_map.resolve('Year', [1999]) == [None]
+    assert id_map.resolve('Year', [2000]) != ['4:old:2']
+    assert id_map.resolve('Article', ['W1']) == ['4:old:3']
+    id_map.close()
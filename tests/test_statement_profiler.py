@@ -0,0 +1,52 @@
+import contextlib
+import io
+import pytest
+from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator
+from src.services.neo4j_graph_builder.fake_driver import FakeDriver, FakeResult
+from src.services.neo4j_graph_builder.statement_profiler import StatementProfiler
+
+ROWS = [{'id': f"W{n}", 'title': f"Article {n}"} for n in range(5)]
+
+
+class LoadedDriver(FakeDriver):
+    """FakeDriver of a database that already holds nodes of the given labels"""
+
+    def __init__(self, loaded_labels):
+        super().__init__()
+        self.loaded_labels = loaded_labels
+
+    def record(self, query, parameters):
+        result = super().record(query, parameters)
+        for label in self.loaded_labels:
+            if query.startswith(f"MATCH (n:{label}) RETURN 1"):
+                return FakeResult([{'found': 1}])
+        return result
+
+
+def profiled_query(driver, label, explain=False):
+    profiler = StatementProfiler(driver=driver, explain=explain)
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = GraphNodeCreator(driver=driver).profile_nodes_batched(label, ROWS, profiler)
+    query = next(query for query, _rows in driver.statements if query.startswith(('PROFILE', 'EXPLAIN')))
+    return report, query
+
+
+def test_empty_label_profiles_the_create_statement():
+    report, query = profiled_query(LoadedDriver([]), 'Article')
+    assert query.startswith('PROFILE UNWIND $rows AS row CREATE (n:Article)')
+    assert report['statement'] == 'Article'
+
+
+def test_loaded_label_profiles_the_merge_statement():
+    report, query = profiled_query(LoadedDriver(['Article']), 'Article')
+    key = GraphNodeCreator.NODE_ID_KEYS['Article']
+    assert query.startswith(f"PROFILE UNWIND $rows AS row MERGE (n:Article {{{key}: row.{key}}})")
+    assert 'MERGE' in report['statement']
+
+
+@pytest.mark.parametrize('loaded', [[], ['Article']])
+def test_explain_keeps_the_create_statement(loaded):
+    driver = LoadedDriver(loaded)
+    _report, query = profiled_query(driver, 'Article', explain=True)
+    assert query.startswith('EXPLAIN UNWIND $rows AS row CREATE (n:Article)')
+    assert not any(statement.startswith('MATCH') for statement, _rows in driver.statements)
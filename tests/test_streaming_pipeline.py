@@ -0,0 +1,32 @@
+import contextlib
+import io
+from src.services.neo4j_graph_builder.create_neo4j_graph import GraphNodeCreator, GraphRelationshipCreator
+from src.services.neo4j_graph_builder.fake_driver import FakeDriver
+from src.services.neo4j_graph_builder.ingestion_benchmark import generate_openalex_frames
+from src.services.neo4j_graph_builder.streaming_pipeline import StreamingImporter
+
+
+def first_statement(driver, predicate):
+    return next(index for index, (query, _rows) in enumerate(driver.statements) if predicate(query))
+
+
+def test_funder_countries_are_written_after_the_country_nodes(tmp_path):
+    raw = generate_openalex_frames(100)
+    paths = {name: str(tmp_path / name) for name in ['articles.jsonl', 'institutions.jsonl', 'funders.json']}
+    raw['articles'].to_json(paths['articles.jsonl'], orient='records', lines=True)
+    raw['institutions'].to_json(paths['institutions.jsonl'], orient='records', lines=True)
+    raw['funders'].set_index('index').to_json(paths['funders.json'], orient='index')
+
+    driver = FakeDriver()
+    importer = StreamingImporter(
+        chunk_size=40,
+        node_creator=GraphNodeCreator(driver=driver),
+        relationship_creator=GraphRelationshipCreator(driver=driver)
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        importer.run(paths['articles.jsonl'], paths['institutions.jsonl'], paths['funders.json'])
+
+    countries = first_statement(driver, lambda query: '(n:Country' in query)
+    located_in = first_statement(driver, lambda query: ':LOCATED_IN]' in query)
+    assert located_in > countries
+    assert sum(rows for query, rows in driver.statements if ':LOCATED_IN]' in query) == len(raw['funders'])